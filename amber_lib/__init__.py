@@ -2,9 +2,11 @@
 amber_lib - a Python HTTP wrapper for interacting with the Amber Engine API
 """
 
-from datetime import datetime, timedelta
+from datetime import timedelta
+import threading
+import time
 
-from amber_lib.resources import send, BaseResource, create_affordance
+from amber_lib.resources import send, BaseResource, IdentityMap, create_affordance
 
 
 class _Config(object):
@@ -19,9 +21,13 @@ class _Config(object):
         self.private = ''
         self.public = ''
         self.request_attempts = 3
+        self.connect_timeout = None # Seconds, for each request attempt
+        self.read_timeout = None # Seconds, for each request attempt
         self.token = ''
         self.on_token_refresh = None
         self.debug = None # Can specify a function that takes 1 argument
+        self.session = None # Can specify a requests.Session (or transport) to send through
+        self.identity_map = None # Can specify an IdentityMap to share embedded instances
 
         for key, value in kwargs.items():
             if hasattr(self, key):
@@ -32,63 +38,122 @@ class _Config(object):
                 raise AttributeError(key)
 
 
+_BASE_RESOURCE_TTL = timedelta(days=7).total_seconds()
+_registries = {} # Keys are (host, port) tuples, values are registries.
+_registries_lock = threading.Lock()
+
+
+class _BaseResourceRegistry(object):
+    """Top-level affordances for a single API host, shared between Contexts.
+
+    The root OPTIONS request is made at most once per expiration period, no
+    matter how many Contexts point at the same host and port. Names which
+    the API does not provide are remembered as well, so repeatedly probing
+    for them does not cost a round trip each time.
+    """
+    def __init__(self):
+        self.listings = {}
+        self.missing = set()
+        self.expire_by = 0
+        self._lock = threading.Lock()
+
+    def refresh(self, cfg):
+        """ Retrieve the root affordances from the API using `cfg`."""
+        with self._lock:
+            self._refresh(cfg)
+
+    def _refresh(self, cfg):
+        # A full refresh starts a new expiration period, and forgets misses.
+        self._fetch(cfg)
+        self.missing = set()
+        self.expire_by = time.monotonic() + _BASE_RESOURCE_TTL
+
+    def _fetch(self, cfg):
+        if cfg.debug:
+            cfg.debug('%s: %s' % (
+                    'amber_lib.__init__._BaseResourceRegistry.refresh',
+                    'retrieving base resources from API'
+                )
+            )
+        self.listings = send('options', cfg, '/')
+
+    def lookup(self, cfg, key):
+        """ Return the affordance listing for `key`, or None if there is none.
+
+        Root affordances are fetched when they have expired. An unknown name
+        triggers a single fetch, in case the API has since added it, after
+        which the miss is cached until the next expiration.
+        """
+        with self._lock:
+            if self.expire_by < time.monotonic():
+                self._refresh(cfg)
+            elif key not in self.listings and key not in self.missing:
+                self._fetch(cfg)
+
+            if key not in self.listings:
+                self.missing.add(key)
+                return None, self.expire_by
+            return self.listings[key], self.expire_by
+
+
+def _get_registry(cfg):
+    with _registries_lock:
+        key = (cfg.host, cfg.port)
+        if key not in _registries:
+            _registries[key] = _BaseResourceRegistry()
+        return _registries[key]
+
+
 class Context(object):
     """Interface for using base API resources, and stores required settings."""
     def __init__(self, **kwargs):
         self.config = _Config(**kwargs)
         self.base_resources = {}
-        self._expire_by = datetime.now()
+        self._expire_by = 0
 
     def __getattr__(self, key):
-        is_expired = self._expire_by < datetime.now()
-
-        if not self.base_resources or is_expired or key not in self.base_resources:
-            # Either no base resources, or past the expiration date. Refresh them.
+        if key.startswith('__') or key in ('config', 'base_resources', '_expire_by'):
+            # Never hit the API for internal or special attributes (copy,
+            # pickle, etc. probe for these before __init__ has run).
+            raise AttributeError(key)
+
+        if key in self.base_resources and self._expire_by > time.monotonic():
+            return self.base_resources[key]
+
+        listing, expire_by = _get_registry(self.config).lookup(self.config, key)
+        if expire_by != self._expire_by:
+            # The shared registry was refreshed; drop affordances built from
+            # the previous listing.
+            self.base_resources = {}
+            self._expire_by = expire_by
+
+        if listing is None:
             if self.config.debug:
                 self.config.debug('%s: %s' % (
-                        'amber_lib.__init__._get_base_resource',
-                        'retrieving base resources from API'
-                    )
-                )
-            self.refresh_base_resources()
-
-        if key not in self.base_resources:
-            if self.config.debug:
-                available_res = [k for k in _base_resources.keys()]
-                self.config.debug('%s: %s' % (
-                        'amber_lib.__init__.get_base_resource',
-                        'current available resources: %s' % available_res
+                        'amber_lib.__init__.Context.__getattr__',
+                        'no API resource named: "%s"' % key
                     )
                 )
             raise AttributeError('No API resource named: "%s"' % key)
 
-        return self.base_resources[key]
+        res = BaseResource()
+        for aff in listing.values():
+            method = aff.get('method', 'get')
+            templated = aff.get('templated', False)
+            name = aff.get('name', '')
+            href = aff.get('href', '')
+
+            res._add_affordance(name, create_affordance(self.config, method, href, templated))
+        self.base_resources[key] = res
+        return res
 
     def refresh_base_resources(self):
         """ Hit the API to retrieve top-level affordances for each resource.
 
-        Send an OPTIONS request to the root path of the API to retrieve a list of
-        all available resources and their generic affordances. Update the module
-        variables `_base_resources` and `_expire_by`.
+        Send an OPTIONS request to the root path of the API to retrieve a list
+        of all available resources and their generic affordances. The result
+        is shared with every other Context using the same host and port.
         """
-        self._expire_by = datetime.now() + timedelta(days=7)
-        if self.config.debug:
-            self.config.debug('%s: %s' % (
-                    'amber_lib.__init__._refresh_base_resources',
-                    'updating "_expire_by" to: %s' % self._expire_by
-                )
-            )
-
-        resp = send('options', self.config, '/')
-        for key, val in resp.items():
-            res = BaseResource()
-            for name in val:
-                aff = val[name]
-                method = aff.get('method', 'get')
-                templated = aff.get('templated', False)
-                name = aff.get('name', '')
-                href = aff.get('href', '')
-
-
-                res._add_affordance(name, create_affordance(self.config, method, href, templated))
-            self.base_resources[key] = res
+        _get_registry(self.config).refresh(self.config)
+        self.base_resources = {}
+        self._expire_by = 0
@@ -0,0 +1,217 @@
+""" Crawl an entire API collection across a pool of worker processes.
+
+Hydrating responses into ResourceInstance objects is CPU-bound, so a single
+process tops out long before the network does. The Crawler splits a
+collection into shards (offset/limit windows, or arbitrary query kwargs such
+as predicate ranges), fetches and hydrates each shard inside a worker process
+with its own Context and HTTP session, and streams the results back as
+compact snapshots.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import os
+import time
+
+import requests
+
+from amber_lib import Context, errors
+from amber_lib.resources import loads
+
+
+# Only these settings are shipped to the workers; callables such as `debug`
+# and `on_token_refresh` are not picklable and stay in the parent.
+_WORKER_SETTINGS = [
+    'host',
+    'port',
+    'public',
+    'private',
+    'token',
+    'request_attempts',
+    'connect_timeout',
+    'read_timeout',
+]
+
+_worker_context = None
+
+
+def _init_worker(settings, transport):
+    """ Build the per-process Context used by every shard in this worker."""
+    global _worker_context
+    _worker_context = Context(session=transport(), **settings)
+
+
+def _dump_item(item):
+    """ Default per-item handler: a binary snapshot of the whole item."""
+    return item.dumps(binary=True)
+
+
+def _crawl_shard(resource, embedded, handler, shard, remaining):
+    """ Fetch a single shard and return the handled items."""
+    deadline = None
+    if remaining is not None:
+        # Monotonic clocks are not comparable between processes, so the
+        # deadline is shipped as the number of seconds left.
+        deadline = time.monotonic() + remaining
+    affordance = getattr(_worker_context, resource).query
+    page = affordance(deadline=deadline, **shard)
+    items = page._embedded.get(embedded, [])
+    return [handler(item) for item in items]
+
+
+class Crawler(object):
+    """ Fetch every item of a collection using a pool of processes.
+
+    For example:
+
+        >>> crawler = Crawler(ctx, 'products', shard_size=200)
+        >>> for state in crawler.crawl():
+        ...     print(state)
+
+    `handler` is run inside the worker on each hydrated ResourceInstance and
+    must be a picklable (module level) function; its return value is what
+    gets streamed back to the parent. By default each item is sent back as a
+    binary snapshot and yielded as a ResourceInstance bound to `context`.
+    Pass a handler which reduces each item to just what is needed to keep
+    the parent process from becoming the bottleneck.
+
+    `transport` is called (in each worker) to create the session used to send
+    requests, and must be picklable; it defaults to requests.Session.
+
+    Workers can not refresh an expired token, since `on_token_refresh` is not
+    sent to them. When the API responds with a 440 the crawl fails at once,
+    with errors.LoginTimeout, rather than retrying shards which can not
+    succeed.
+
+    When `shards` is provided it must be a list of kwarg dicts, each of which
+    is passed directly to the resource's `query` affordance (for example a
+    `body` with a range predicate). Otherwise the collection is walked in
+    `shard_size` offset/limit windows until a short shard is returned, or up
+    to `total` items if that is known up front.
+    """
+
+    def __init__(self, context, resource, shard_size=100, processes=None,
+                 shards=None, total=None, embedded=None, handler=None,
+                 shard_attempts=3, transport=None, **query_kwargs):
+        self.settings = {k: getattr(context.config, k) for k in _WORKER_SETTINGS}
+        self.resource = resource
+        self.embedded = embedded if embedded else resource
+        self.shard_size = shard_size
+        self.processes = processes if processes else os.cpu_count() or 1
+        self.shards = shards
+        self.total = total
+        self.handler = handler if handler else _dump_item
+        self.load = handler is None
+        self.config = context.config
+        self.shard_attempts = shard_attempts
+        self.transport = transport if transport else requests.Session
+        self.query_kwargs = query_kwargs
+        self.debug = context.config.debug
+
+    def _offset_shard(self, offset):
+        shard = dict(self.query_kwargs)
+        shard['limit'] = self.shard_size
+        shard['offset'] = offset
+        return shard
+
+    def crawl(self, deadline=None):
+        """ Yield handled items as their shards complete.
+
+        Shards complete out of order, so items are not yielded in collection
+        order. A shard that raises is resubmitted up to `shard_attempts`
+        times before its error is re-raised in the parent.
+
+        `deadline` is an optional `time.monotonic()` value by which the whole
+        crawl must finish. Once it passes, queued shards are cancelled, and
+        errors.DeadlineExceeded is raised. Queued shards are also cancelled
+        if the caller stops iterating early.
+        """
+        pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            initializer=_init_worker,
+            initargs=(self.settings, self.transport)
+        )
+        pending = {}
+
+        def remaining():
+            if deadline is None:
+                return None
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise errors.DeadlineExceeded('crawl', self.resource)
+            return left
+
+        def submit(shard, attempt=1):
+            future = pool.submit(
+                _crawl_shard,
+                self.resource,
+                self.embedded,
+                self.handler,
+                shard,
+                remaining()
+            )
+            pending[future] = (shard, attempt)
+
+        finished = False
+        try:
+            if self.shards is not None:
+                for shard in self.shards:
+                    submit(shard)
+                next_offset = None
+            else:
+                # Keep a couple of shards queued per worker; stop queueing more
+                # once we reach `total`, or once any shard comes back short.
+                next_offset = 0
+                while len(pending) < self.processes * 2:
+                    if self.total is not None and next_offset >= self.total:
+                        break
+                    submit(self._offset_shard(next_offset))
+                    next_offset += self.shard_size
+
+            exhausted = False
+            while pending:
+                done, _ = wait(
+                    list(pending),
+                    timeout=remaining(),
+                    return_when=FIRST_COMPLETED
+                )
+                if not done:
+                    remaining() # Raises, since the deadline has passed.
+                    continue
+                future = done.pop()
+                shard, attempt = pending.pop(future)
+                try:
+                    items = future.result()
+                except (errors.DeadlineExceeded, errors.LoginTimeout):
+                    # Retrying can not help; workers can not refresh tokens.
+                    raise
+                except Exception:
+                    if attempt >= self.shard_attempts:
+                        raise
+                    if self.debug:
+                        self.debug('%s: %s' % (
+                                'amber_lib.crawler.Crawler.crawl',
+                                'retrying shard %s (attempt %i)' % (shard, attempt + 1)
+                            )
+                        )
+                    submit(shard, attempt + 1)
+                    continue
+
+                if next_offset is not None:
+                    if len(items) < self.shard_size:
+                        exhausted = True
+                    elif not exhausted and (self.total is None or next_offset < self.total):
+                        submit(self._offset_shard(next_offset))
+                        next_offset += self.shard_size
+
+                for item in items:
+                    if self.load:
+                        item = loads(item, self.config)
+                    yield item
+            finished = True
+        finally:
+            # On an error, or when the caller stops iterating (GeneratorExit),
+            # drop the queued shards rather than waiting for all of them.
+            if not finished:
+                for future in pending:
+                    future.cancel()
+            pool.shutdown(wait=finished)
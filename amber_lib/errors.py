@@ -15,6 +15,16 @@ class Error(Exception):
         super(Error, self).__init__(*args, **kwargs)
 
 
+class DeadlineExceeded(Error):
+    """A request (or group of requests) ran past its deadline."""
+    pass
+
+
+class UnmatchedRequest(Error):
+    """A replayed request has no matching recording in the cassette."""
+    pass
+
+
 @http_error(400)
 class BadRequest(Error):
     pass
@@ -45,6 +55,11 @@ class NotAcceptable(Error):
     pass
 
 
+@http_error(408)
+class RequestTimeout(Error):
+    pass
+
+
 @http_error(410)
 class Gone(Error):
     pass
@@ -65,7 +80,21 @@ class AuthenticationTimeout(Error):
     pass
 
 
+@http_error(440)
+class LoginTimeout(Error):
+    pass
+
+
 @http_error(500)
 class ServerError(Error):
     pass
 
+
+@http_error(502)
+class BadGateway(Error):
+    pass
+
+
+@http_error(504)
+class GatewayTimeout(Error):
+    pass
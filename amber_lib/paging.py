@@ -0,0 +1,137 @@
+""" Page through query affordances with an automatically tuned page size.
+
+Small pages waste round trips, while large pages are slow, may time out, and
+use a lot of memory while hydrating. The AdaptivePager measures the latency,
+size and hydration time of every page, and grows or shrinks `limit` for the
+next page to stay near a target page time (and optional size budget).
+
+For example:
+
+    >>> pager = AdaptivePager(ctx.products.query, 'products', target_latency=0.5)
+    >>> for prod in pager.items():
+    ...     print(prod)
+    >>> print(pager.limit) # The page size it settled on.
+"""
+
+import requests
+
+from amber_lib import errors
+
+
+# Failures which a smaller (quicker) page may avoid.
+_RETRY_SMALLER = (
+    errors.RequestTimeout,
+    errors.ServerError,
+    errors.BadGateway,
+    errors.GatewayTimeout,
+    requests.exceptions.Timeout,
+)
+
+
+class AdaptivePager(object):
+    """ Iterate the pages of a query affordance, adapting the page size.
+
+    `embedded` is the name of the embedded resource list used to count the
+    items in each page. Paging stops at the first page with fewer items than
+    were asked for. Additional kwargs (e.g. `body`) are passed to every call.
+
+    Between pages, `limit` moves towards the size which would take
+    `target_latency` seconds (including hydration) and, if `max_bytes` is
+    set, stay within that response size. It changes by at most a factor of
+    two per page, and stays between `min_limit` and `max_limit`. A page which
+    fails with a timeout (408, 504 or a client side timeout), server error
+    (500) or bad gateway (502) is retried, up to `attempts` times, at half
+    the size. Each request is only attempted once by `send`, so the pager
+    shrinks on the first failure, and the halved size becomes a `ceiling`
+    which later pages never grow past.
+
+    After each page, `limit` is the page size the pager has settled on, and
+    `history` lists a (limit, items, latency, bytes, hydration) tuple for
+    every page.
+    """
+
+    def __init__(self, affordance, embedded, limit=100, min_limit=10,
+                 max_limit=1000, target_latency=1.0, max_bytes=None,
+                 offset=0, attempts=3, **query_kwargs):
+        if not min_limit <= limit <= max_limit:
+            raise ValueError('limit must be between min_limit and max_limit')
+
+        self.affordance = affordance
+        self.embedded = embedded
+        self.limit = limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.max_bytes = max_bytes
+        self.offset = offset
+        self.attempts = attempts
+        self.query_kwargs = query_kwargs
+        self.history = []
+        self.ceiling = None # Set below the size of a page which failed.
+
+    def _fetch(self, deadline):
+        failures = 0
+        while True:
+            stats = {}
+            try:
+                page = self.affordance(
+                    limit=self.limit,
+                    offset=self.offset,
+                    deadline=deadline,
+                    stats=stats,
+                    request_attempts=1,
+                    **self.query_kwargs
+                )
+                return page, stats
+            except _RETRY_SMALLER:
+                failures += 1
+                if failures >= self.attempts:
+                    raise
+                self.limit = max(self.min_limit, self.limit // 2)
+                self.ceiling = self.limit
+
+    def _adjust(self, count, stats):
+        """ Pick the next page size from the cost of the last page."""
+        if not count:
+            return
+        per_item = (stats.get('latency', 0) + stats.get('hydration', 0)) / count
+        ideal = self.target_latency / per_item if per_item > 0 else self.max_limit
+        if self.max_bytes and stats.get('bytes'):
+            ideal = min(ideal, self.max_bytes / (stats['bytes'] / count))
+
+        ideal = max(self.limit / 2, min(self.limit * 2, ideal))
+        max_limit = self.max_limit if self.ceiling is None else self.ceiling
+        self.limit = int(max(self.min_limit, min(max_limit, ideal)))
+
+    def pages(self, deadline=None):
+        """ Yield each page as a ResourceInstance.
+
+        `deadline` (see resources.send) applies to the entire iteration.
+        """
+        while True:
+            page, stats = self._fetch(deadline)
+            limit = self.limit
+            count = len(page._embedded.get(self.embedded, []))
+            self.history.append((
+                limit,
+                count,
+                stats.get('latency'),
+                stats.get('bytes'),
+                stats.get('hydration')
+            ))
+
+            self.offset += count
+            yield page
+
+            if count < limit:
+                return
+            self._adjust(count, stats)
+
+    def items(self, deadline=None):
+        """ Yield each item of each page, e.g. to build a table.Table."""
+        for page in self.pages(deadline):
+            for item in page._embedded.get(self.embedded, []):
+                yield item
+
+    def __iter__(self):
+        return self.pages()
@@ -42,7 +42,7 @@ class And(WhereItem):
 
         for index, child in enumerate(children):
             if isinstance(child, Predicate):
-                child = WhereItem(pred=second)
+                child = WhereItem(pred=child)
             elif not isinstance(child, WhereItem):
                 raise TypeError("'%s' must be a Predicate or WhereItem" % child)
 
@@ -81,7 +81,7 @@ class Or(WhereItem):
 
         for index, child in enumerate(children):
             if isinstance(child, Predicate):
-                child = WhereItem(pred=second)
+                child = WhereItem(pred=child)
             elif not isinstance(child, WhereItem):
                 raise TypeError("'%s' must be a Predicate or WhereItem" % child)
 
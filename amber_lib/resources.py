@@ -1,15 +1,20 @@
+from concurrent import futures
 from datetime import datetime
+import copy
 from urllib.parse import quote, urlparse
 import base64
-import functools
 import hashlib
 import json
 import re
+import threading
+import time
 import warnings
+import weakref
+import zlib
 
 import requests
 
-from amber_lib import errors, query
+from amber_lib import errors, query, table
 
 
 def _def_wrapper_recursion(val):
@@ -25,6 +30,57 @@ def _def_wrapper_recursion(val):
         return [_def_wrapper_recursion(e) for e in val]
     return val
 
+
+def _adopt(parent, key, value):
+    """ Point nested wrappers at the wrapper (and key) that holds them.
+
+    This lets a change deep inside a ResourceInstance's state be recorded as
+    a path on the instance itself. Dictionaries inside of lists are owned by
+    the list's key, since a list can only be sent back as a whole.
+    ResourceInstances are never adopted; each one tracks its own changes.
+    """
+    if isinstance(value, DictionaryWrapper):
+        if not isinstance(value, ResourceInstance):
+            object.__setattr__(value, '_owner', (parent, key, False))
+    elif type(value) is list:
+        for item in value:
+            if isinstance(item, DictionaryWrapper) and not isinstance(item, ResourceInstance):
+                object.__setattr__(item, '_owner', (parent, key, True))
+
+
+def _claim(parent, key, value):
+    """ Adopt a value being set into `parent`, copying it if already owned.
+
+    A wrapper can only report its changes to one owner, so a wrapper which
+    is still held elsewhere (e.g. by another instance's state) is copied.
+    """
+    kind = type(value)
+    if kind is DictionaryWrapper:
+        if value._owner is not None:
+            value = DictionaryWrapper(value)
+        object.__setattr__(value, '_owner', (parent, key, False))
+    elif kind is list:
+        for index, item in enumerate(value):
+            if type(item) is DictionaryWrapper and item._owner is not None:
+                value[index] = DictionaryWrapper(item)
+        _adopt(parent, key, value)
+    return value
+
+
+def _release(parent, value):
+    """ Stop a value which was removed from `parent` reporting changes to it."""
+    if isinstance(value, DictionaryWrapper):
+        items = [value]
+    elif type(value) is list:
+        items = value
+    else:
+        return
+    for item in items:
+        if isinstance(item, DictionaryWrapper) and item._owner is not None \
+                and item._owner[0] is parent:
+            object.__setattr__(item, '_owner', None)
+
+
 class DictionaryWrapper(dict):
     """A dictionary whose items can be accessed using 'dot notation'.
 
@@ -44,6 +100,9 @@ class DictionaryWrapper(dict):
     if the value is a dictionary then it is converted into a DictionaryWrapper.
     """
 
+    _owner = None # (parent wrapper, key, is list item), see _adopt
+    _changes = None # Only ResourceInstances track changes.
+
     def __init__(self, dict_=None, *args, **kwargs):
         if not dict_:
             return
@@ -64,18 +123,70 @@ class DictionaryWrapper(dict):
 
     def __setattr__(self, key, value):
         try:
-            return super(DictionaryWrapper, self).__setitem__(
-                key,
-                _def_wrapper_recursion(value)
-            )
+            return self.__setitem__(key, value)
         except KeyError:
             raise AttributeError("'%s' not in %s" % (key, list(self.keys())))
 
     def __setitem__(self, key, value):
-        return super(DictionaryWrapper, self).__setitem__(
-            key,
-            _def_wrapper_recursion(value)
-        )
+        value = _def_wrapper_recursion(value)
+        old = dict.get(self, key)
+        if old is not None:
+            _release(self, old)
+        kind = type(value)
+        if kind is DictionaryWrapper or kind is list:
+            value = _claim(self, key, value)
+        super(DictionaryWrapper, self).__setitem__(key, value)
+        if self._owner is not None or self._changes is not None:
+            self._changed(key)
+
+    def __delitem__(self, key):
+        _release(self, dict.get(self, key))
+        super(DictionaryWrapper, self).__delitem__(key)
+        self._changed(key)
+
+    def pop(self, key, *args):
+        had_key = key in self
+        value = super(DictionaryWrapper, self).pop(key, *args)
+        if had_key:
+            _release(self, value)
+            self._changed(key)
+        return value
+
+    def popitem(self):
+        key, value = super(DictionaryWrapper, self).popitem()
+        _release(self, value)
+        self._changed(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return super(DictionaryWrapper, self).__getitem__(key)
+
+    def clear(self):
+        items = list(self.items())
+        super(DictionaryWrapper, self).clear()
+        for key, value in items:
+            _release(self, value)
+            self._changed(key)
+
+    def _changed(self, key):
+        """ Report a changed key, as a path, to the outermost owning wrapper."""
+        if self._owner is None and self._changes is None:
+            # Not owned, and not tracking (e.g. still being populated).
+            return
+        path = (key,)
+        node = self
+        while node._owner is not None:
+            node, parent_key, is_list_item = node._owner
+            if is_list_item:
+                path = (parent_key,)
+            else:
+                path = (parent_key,) + path
+        node._record_change(path)
+
+    def _record_change(self, path):
+        pass
 
     def update(self, dict_):
         """ Override default `update` method to modify any dictionary values.
@@ -112,12 +223,71 @@ class BaseResource(object):
         raise AttributeError("'%s' does not exist" % key)
 
 
+def _config(cfg):
+    """ Return the _Config to use for `cfg`, which may also be a Context."""
+    return getattr(cfg, 'config', cfg)
+
+
+def _pk_field(type_):
+    """ Return the name of the primary key field for the given resource type."""
+    if type_ == "products":
+        return "guid"
+    return "id"
+
+
+class IdentityMap(object):
+    """ Share a single ResourceInstance per embedded entity.
+
+    Entities are keyed by their resource type and primary key (using the same
+    convention as EmbeddedList.pk). Only weak references are held, so entries
+    disappear once nothing else references the instance.
+
+    When an entity is seen again, the shared instance's state, links and
+    embedded entities are replaced with the new ones, unless it has changes
+    which have not been saved yet; those are never overwritten.
+
+    For example:
+
+        >>> ctx = Context(identity_map=IdentityMap(), ...)
+        >>> a = ctx.products.query()
+        >>> b = ctx.products.query()
+        >>> a._embedded.products[0] is b._embedded.products[0]
+        True
+    """
+
+    def __init__(self):
+        self._instances = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, type_, pk):
+        return self._instances.get((type_, pk))
+
+    def merge(self, type_, pk, inst):
+        """ Map the freshly hydrated `inst`, and return the shared instance.
+
+        If an instance is already mapped it is refreshed from `inst` (unless
+        it has unsaved changes) and returned instead.
+        """
+        with self._lock:
+            existing = self._instances.get((type_, pk))
+            if existing is None:
+                self._instances[(type_, pk)] = inst
+                return inst
+            if not existing._changes:
+                existing._replace(inst)
+            return existing
+
+    def clear(self):
+        with self._lock:
+            self._instances.clear()
+
+    def __len__(self):
+        return len(self._instances)
+
+
 class EmbeddedList(list):
     def __init__(self, type_=None, *args, **kwargs):
-        if type_ == "products":
-            self._pk_field = "guid"
-        else:
-            self._pk_field = "id"
+        self._pk_field = _pk_field(type_)
 
         self._id_mapping = {} # contains pk->index pairs
         super().__init__(*args, **kwargs)
@@ -149,6 +319,137 @@ class EmbeddedList(list):
         else:
             return self[self._id_mapping[id_]]
 
+    def prefetch(self, path, max_workers=8, deadline=None):
+        """ Resolve the named link for every item in the list at once.
+
+        See `prefetch` for details.
+        """
+        return prefetch(self, path, max_workers, deadline)
+
+    def to_table(self, fields=None):
+        """ Convert the list into a columnar table.Table.
+
+        See `table.Table.from_instances` for details.
+        """
+        return table.Table.from_instances(self, fields)
+
+
+def _map_concurrently(fn, items, max_workers, deadline=None):
+    """ Call `fn` on each item using a bounded thread pool, preserving order.
+
+    If `deadline` passes first, calls which have not started are cancelled
+    and errors.DeadlineExceeded is raised. (Calls already in flight should
+    be passed the deadline too, so they give up on their own.)
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [fn(item) for item in items]
+
+    timeout = None
+    if deadline is not None:
+        timeout = max(deadline - time.monotonic(), 0)
+    pool = futures.ThreadPoolExecutor(max_workers=min(max_workers, len(items)))
+    pending = [pool.submit(fn, item) for item in items]
+    try:
+        done, not_done = futures.wait(
+            pending,
+            timeout=timeout,
+            return_when=futures.FIRST_EXCEPTION
+        )
+        for future in done:
+            if future.exception() is not None:
+                future.result() # Re-raises the first failure.
+        if not_done:
+            raise errors.DeadlineExceeded()
+        return [future.result() for future in pending]
+    finally:
+        # Drop the calls which have not started, rather than waiting for them.
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
+def prefetch(instances, path, max_workers=8, deadline=None):
+    """ Follow the same link on many ResourceInstances with batched requests.
+
+    `path` is a link name, or several link names joined by dots to follow
+    multiple levels (e.g. "brand.manufacturer"). Identical links (same
+    method, href and body params) are only requested once, requests run
+    concurrently on at most `max_workers` threads, and each result is added
+    to its item's `_embedded` EmbeddedList named after the link:
+
+        >>> prods._embedded.products.prefetch("brand")
+        >>> prods._embedded.products[0]._embedded.brand[0].name
+
+    A result is not added if the list already holds a resource with the
+    same primary key (e.g. one the API embedded itself).
+
+    Items without the link are skipped. Returns an EmbeddedList of the
+    distinct resources fetched for the last link in the path. `deadline`
+    (see `send`) applies to the whole traversal.
+    """
+    names = path.split('.')
+    fetched = EmbeddedList()
+    for name in names:
+        links = {} # (method, href, body)->link pairs, so duplicates are fetched once
+        owners = []
+        for inst in instances:
+            link = inst.get('_links', {}).get(name)
+            if link is None:
+                continue
+            if not callable(link) or link.get('templated'):
+                raise TypeError("Link '%s' can not be prefetched" % name)
+            key = (
+                link['method'],
+                link['href'],
+                json.dumps(link._body, sort_keys=True)
+            )
+            links.setdefault(key, link)
+            owners.append((inst, key))
+
+        keys = list(links.keys())
+        results = dict(zip(
+            keys,
+            _map_concurrently(
+                lambda key: links[key](deadline=deadline),
+                keys,
+                max_workers,
+                deadline
+            )
+        ))
+        for inst, key in owners:
+            result = results[key]
+            if name not in inst._embedded:
+                inst._embedded[name] = EmbeddedList(name)
+            embedded = inst._embedded[name]
+            pk = result.get(embedded._pk_field)
+            if pk is not None and pk in embedded._id_mapping:
+                continue
+            if not any(item is result for item in embedded):
+                embedded.append(result)
+
+        fetched = EmbeddedList()
+        for key in keys:
+            fetched.append(results[key])
+        instances = fetched
+    return fetched
+
+
+def save_many(instances, max_workers=8, deadline=None):
+    """ Save every changed ResourceInstance concurrently.
+
+    Unchanged instances are skipped. Returns the responses of the saved
+    instances, in order.
+    """
+    changed = [inst for inst in instances if inst.diff()]
+    return _map_concurrently(
+        lambda inst: inst.save(deadline=deadline),
+        changed,
+        max_workers,
+        deadline
+    )
+
+
 def create_url(context, endpoint, **uri_args):
     """ Create a full URL using the provided components."""
 
@@ -173,12 +474,47 @@ def create_url(context, endpoint, **uri_args):
     return urlparse(url).geturl()
 
 
-def send(method, cfg, endpoint, json_data=None, **uri_params):
+def _timeout(cfg, deadline, method, url):
+    """ Return the (connect, read) timeout for the next attempt of a request.
+
+    The configured timeouts are shortened to whatever time is left before
+    the deadline, if there is one.
+    """
+    connect = cfg.connect_timeout
+    read = cfg.read_timeout
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise errors.DeadlineExceeded(method, url)
+        connect = remaining if connect is None else min(connect, remaining)
+        read = remaining if read is None else min(read, remaining)
+    if connect is None and read is None:
+        return None
+    return (connect, read)
+
+
+def send(method, cfg, endpoint, json_data=None, deadline=None, stats=None,
+         request_attempts=None, **uri_params):
     """Execute an HTTP request constructed from the provided parameters.
 
     The method must be a valid HTTP method. Body data is sent in JSON format,
     and must be `None` or a dictionary. URI Params are key-value pairs which
     must be string-able.
+
+    `deadline` is an optional `time.monotonic()` value by which the request,
+    including any retries and token refreshing, must be completed. Once it
+    passes, errors.DeadlineExceeded is raised.
+
+    `request_attempts` overrides the configured number of attempts, e.g. 1
+    for callers which handle failures themselves.
+
+    On a 440, when `on_token_refresh` is configured, the token is refreshed
+    and the request is retried. This happens at most once per request, and
+    counts as one of its attempts (but always leaves one to retry with).
+
+    If a `stats` dictionary is provided, the "latency" (in seconds, including
+    retries) and response size in "bytes" of a successful request are stored
+    in it.
     """
     method = method.lower()
 
@@ -211,54 +547,86 @@ def send(method, cfg, endpoint, json_data=None, **uri_params):
         payload = dump(json_data)
     else:
         payload = '{}'
-    current_timestamp = datetime.isoformat(datetime.utcnow())
-
-
-    auth_string = ''
-
-    # Standard headers that are present for each HTTP request.
-    headers = {
-            'Accept': 'application/hal+json',
-            'Content-Type': 'application/json',
-            'Public-Key': cfg.public if cfg.public else '',
-            'Timestamp': current_timestamp,
-            'URL': url
-            }
-
-    if cfg.token:
-        # If a JWT token is available, use in-place of signature.
-        auth_string = cfg.token
-        if cfg.debug:
-            cfg.debug('%s: %s' % (
-                    'amber_lib.resources.send',
-                    'using json web token instead of Public/Private keys'
+
+    def sign():
+        """ Build the headers, authorized with the current token or keys."""
+        current_timestamp = datetime.isoformat(datetime.utcnow())
+
+        auth_string = ''
+
+        # Standard headers that are present for each HTTP request.
+        headers = {
+                'Accept': 'application/hal+json',
+                'Content-Type': 'application/json',
+                'Public-Key': cfg.public if cfg.public else '',
+                'Timestamp': current_timestamp,
+                'URL': url
+                }
+
+        if cfg.token:
+            # If a JWT token is available, use in-place of signature.
+            auth_string = cfg.token
+            if cfg.debug:
+                cfg.debug('%s: %s' % (
+                        'amber_lib.resources.send',
+                        'using json web token instead of Public/Private keys'
+                    )
                 )
-            )
-    else:
-        # Create a signiture using the request's headers and the payload
-        # data.
-        # Encode/decode is required for the hashing/encrypting functions.
-        sig = '%s%s%s' % (dump(headers), payload, cfg.private)
-        sig = base64.b64encode(
-                hashlib.sha256(sig.encode('utf-8')).hexdigest().encode('utf-8')
-                ).decode('ascii')
-        auth_string = sig
-
-    headers['Authorization'] = 'Bearer %s' % auth_string
+        else:
+            # Create a signiture using the request's headers and the payload
+            # data.
+            # Encode/decode is required for the hashing/encrypting functions.
+            sig = '%s%s%s' % (dump(headers), payload, cfg.private)
+            sig = base64.b64encode(
+                    hashlib.sha256(sig.encode('utf-8')).hexdigest().encode('utf-8')
+                    ).decode('ascii')
+            auth_string = sig
+
+        headers['Authorization'] = 'Bearer %s' % auth_string
+        return headers
+
+    headers = sign()
     r = None
     # If request fails and status code is any of the following, attempt a rety.
     retry_on = [408, 419, 500, 502, 504]
     attempts = 0
+    max_attempts = request_attempts if request_attempts else cfg.request_attempts
+    refreshed = False
+
+    # Reuse the configured session's connection pool (or other transport,
+    # see amber_lib.transport), when one is provided.
+    transport = cfg.session if cfg.session else requests
+    started = time.monotonic()
+
+    while attempts < max_attempts:
+        try:
+            r = transport.request(
+                method,
+                url,
+                data=payload,
+                headers=headers,
+                timeout=_timeout(cfg, deadline, method, url)
+            )
+        except requests.exceptions.Timeout:
+            if deadline is not None and deadline <= time.monotonic():
+                raise errors.DeadlineExceeded(method, url)
+            attempts += 1
+            if attempts >= max_attempts:
+                raise
+            continue
 
-    while attempts < cfg.request_attempts:
-        r = getattr(requests, method)(url, data=payload, headers=headers)
         status = r.status_code
         if status == 200:
+            if stats is not None:
+                stats['latency'] = time.monotonic() - started
+                stats['bytes'] = len(r.content)
             try:
                 return r.json()
             except ValueError:
                 return {}
-        elif status == 440 and cfg.on_token_refresh:
+        elif status == 440 and cfg.on_token_refresh and cfg.token and not refreshed:
+            # Refresh the token at most once per request; a second 440
+            # means refreshing does not help.
             claims = cfg.token.split('.')[1]
             if 4 - len(claims) % 4 > 0:
                 claims += '=' * (4 - len(claims) % 4)
@@ -269,10 +637,13 @@ def send(method, cfg, endpoint, json_data=None, **uri_params):
                 "post",
                 cfg,
                 "/tokens",
-                {"public": claims_dict["sub"]}
+                {"public": claims_dict["sub"]},
+                deadline=deadline
             )["key"]
             cfg.on_token_refresh(cfg.token)
-            return send(method, cfg, endpoint, json_data, **uri_params)
+            refreshed = True
+            headers = sign()
+            attempts = min(attempts + 1, max_attempts - 1)
         elif status in retry_on:
             attempts += 1
         else:
@@ -306,6 +677,51 @@ def send(method, cfg, endpoint, json_data=None, **uri_params):
         raise Exception(method, url)
 
 
+class Link(DictionaryWrapper):
+    """ A single affordance of a ResourceInstance, callable like a function.
+
+    The method, href and templated flag are stored as the link's state. The
+    underlying affordance function is only created the first time the link
+    is called, and is bound to `cfg`. Unbound links (e.g. ones that have been
+    unpickled) must be bound using ResourceInstance.bind before use.
+    """
+
+    def __init__(self, cfg, method, href, templated, body=None):
+        super().__init__()
+        dict.update(self, method=method, href=href, templated=templated)
+        object.__setattr__(self, '_cfg', cfg)
+        object.__setattr__(self, '_body', body if body else {})
+        object.__setattr__(self, '_fn', None)
+
+    def bind(self, cfg):
+        object.__setattr__(self, '_cfg', _config(cfg))
+        object.__setattr__(self, '_fn', None)
+
+    def __call__(self, *args, **kwargs):
+        if self._fn is None:
+            if self._cfg is None:
+                raise TypeError("Link '%s' is not bound to a config" % self['href'])
+            object.__setattr__(self, '_fn', create_affordance(
+                self._cfg,
+                self['method'],
+                self['href'],
+                self['templated']
+            ))
+        kwargs.setdefault('body', self._body)
+        return self._fn(*args, **kwargs)
+
+    def __reduce__(self):
+        return (Link, (None, self['method'], self['href'], self['templated'], dict(self._body)))
+
+    # Copies stay bound to the same config; only pickles are unbound.
+    def __copy__(self):
+        return Link(self._cfg, self['method'], self['href'], self['templated'], self._body)
+
+    def __deepcopy__(self, memo):
+        body = copy.deepcopy(self._body, memo)
+        return Link(self._cfg, self['method'], self['href'], self['templated'], body)
+
+
 class LinkContainer(DictionaryWrapper):
     def __getattribute__(self, name):
         if name in ['update', 'values']:
@@ -318,15 +734,111 @@ class ResourceInstance(DictionaryWrapper):
 
     State will always be a normal dictionary. Any embedded entities will be
     ResourceInstance instances, with their own state, affordances, etc.
+
+    Once populated from a response, changes made to the state (including
+    nested dictionaries) are tracked, so that `save` only needs to send the
+    fields which actually changed. Lists are not tracked: after changing a
+    list in place, assign it again (`inst.tags = inst.tags`) to record it.
     """
 
+    _changes = None # Set of changed key paths, or None when not tracking.
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self._links= LinkContainer()
-        self._embedded = DictionaryWrapper()
+        # Neither container needs converting, so skip DictionaryWrapper.__setitem__.
+        dict.__setitem__(self, '_links', LinkContainer())
+        dict.__setitem__(self, '_embedded', DictionaryWrapper())
+
+    def _record_change(self, path):
+        if self._changes is not None and path[0] not in ('_links', '_embedded'):
+            self._changes.add(path)
+
+    def _replace(self, other):
+        """ Take over the state, links and embedded entities of `other`."""
+        object.__setattr__(self, '_changes', None)
+        for value in dict.values(self):
+            _release(self, value)
+        for key in [k for k in self if k not in other]:
+            dict.__delitem__(self, key)
+        dict.update(self, other)
+        for key, value in dict.items(other):
+            _adopt(self, key, value)
+        self._track_changes()
+
+    def _track_changes(self):
+        """ Start (or restart) tracking changes from the current state."""
+        object.__setattr__(self, '_changes', set())
+
+    def diff(self):
+        """ Return the changed state as a minimal JSON merge patch.
+
+        Only the changed paths are included; nested changes are nested in the
+        same way as the state. Deleted keys have a value of None.
+        """
+        return self._diff(self._changes)
+
+    def _diff(self, changes):
+        if not changes:
+            return {}
+
+        patch = {}
+        sent = set()
+        for path in sorted(changes, key=len):
+            if any(path[:i] in sent for i in range(1, len(path))):
+                continue # A parent path is already being sent as a whole.
+            sent.add(path)
+
+            value = self
+            for key in path:
+                if not isinstance(value, dict) or key not in value:
+                    value = None
+                    break
+                value = dict.__getitem__(value, key)
+
+            target = patch
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+        return patch
+
+    def save(self, link_name=None, deadline=None):
+        """ Send only the changed state through the resource's patch affordance.
+
+        If `link_name` is not provided, the first link with a PATCH method is
+        used. Returns the response's ResourceInstance, or None if nothing has
+        changed since the instance was populated (or last saved).
+
+        Changes made while the request is in flight are kept for the next
+        save; if the request fails, the sent changes are kept as well.
+        """
+        if not self._changes:
+            return None
+
+        if link_name is not None:
+            link = self._links[link_name]
+        else:
+            link = None
+            for candidate in dict.values(self._links):
+                if isinstance(candidate, Link) and candidate['method'].lower() == 'patch':
+                    link = candidate
+                    break
+            if link is None:
+                raise AttributeError('No patch affordance available')
+
+        # Swap in a fresh set first, so edits made from here on are kept.
+        changes = self._changes
+        self._track_changes()
+        try:
+            return link(body=self._diff(changes), deadline=deadline)
+        except BaseException:
+            self._changes.update(changes)
+            raise
 
     def _from_response(self, cfg, dict_):
+        # Populating from the API is not a change; stop tracking until done.
+        object.__setattr__(self, '_changes', None)
+
         def unserialize_link(link_dict):
             method = link_dict.get("method", "get")
             templated = link_dict.get("templated", False)
@@ -345,38 +857,115 @@ class ResourceInstance(DictionaryWrapper):
             if kids:
                 return LinkContainer(kids) # THIS WONT WORK WITH INJECTION STATE!! TODO TODO TODO
             else:
-                new_call = functools.partial(
-                    create_affordance(
-                        cfg,
-                        method,
-                        href,
-                        templated
-                    ),
-                    body=body
-                )
-                link = type('Link', (DictionaryWrapper,), {'__call__': new_call})()
-                link['method'] = method
-                link['href'] = href
-                link['templated'] = templated
-                return link
+                return Link(cfg, method, href, templated, body)
 
+        links = dict.__getitem__(self, '_links')
+        embedded = dict.__getitem__(self, '_embedded')
         for key, value in dict_.items():
             if key == '_embedded' and isinstance(value, dict):
                 for resName, resListing in value.items():
-                    if resName not in self._embedded:
-                        self._embedded[resName] = EmbeddedList(resName)
+                    if resName not in embedded:
+                        embedded[resName] = EmbeddedList(resName)
+                    listing = embedded[resName]
+                    pk_field = _pk_field(resName)
                     for embeddedState in resListing:
                         inst = ResourceInstance()
                         inst._from_response(cfg, embeddedState)
-                        self._embedded[resName].append(inst)
+                        if cfg.identity_map is not None:
+                            pk = embeddedState.get(pk_field)
+                            if pk is not None:
+                                inst = cfg.identity_map.merge(resName, pk, inst)
+                        listing.append(inst)
             elif key == '_links' and isinstance(value, dict):
                 if isinstance(value, dict):
                     value = [val for val in value.values()]
                 for aff in value:
-                    self._links[aff.get('name')] = unserialize_link(aff)
+                    dict.__setitem__(links, aff.get('name'), unserialize_link(aff))
             else:
                 self[key] = value
 
+        self._track_changes()
+
+    def bind(self, cfg):
+        """ Bind every link in this instance (and its embedded instances) to `cfg`.
+
+        `cfg` may be a Context or its config.
+        """
+        cfg = _config(cfg)
+
+        def bind_links(links):
+            for link in dict.values(links):
+                if isinstance(link, Link):
+                    link.bind(cfg)
+                else:
+                    bind_links(link)
+
+        bind_links(self._links)
+        for embedded in self._embedded.values():
+            for inst in embedded:
+                inst.bind(cfg)
+
+    def _snapshot(self):
+        def snapshot_links(links):
+            snap = []
+            for name, link in links.items():
+                if isinstance(link, Link):
+                    snap.append([
+                        name,
+                        link['method'],
+                        link['href'],
+                        link['templated'],
+                        link._body
+                    ])
+                else:
+                    snap.append([name, snapshot_links(link)])
+            return snap
+
+        state = {k: v for k, v in self.items() if k not in ('_links', '_embedded')}
+        embedded = []
+        for name, value in self._embedded.items():
+            embedded.append([name, [inst._snapshot() for inst in value]])
+        return [state, snapshot_links(self._links), embedded]
+
+    def dumps(self, binary=False):
+        """ Serialize the instance into a compact snapshot.
+
+        The snapshot includes state, link descriptors and embedded instances,
+        and is a JSON string, or zlib-compressed bytes when `binary` is True.
+        Use `loads` to turn it back into a ResourceInstance.
+        """
+        data = json.dumps(
+            [_SNAPSHOT_VERSION, self._snapshot()],
+            separators=(',', ':')
+        )
+        if binary:
+            return zlib.compress(data.encode('utf-8'))
+        return data
+
+    def __reduce__(self):
+        return (loads, (self.dumps(binary=True),))
+
+    # Copying does not go through a snapshot (see __reduce__), so links stay
+    # bound, and the state may hold values which are not JSON serializable.
+    def __copy__(self):
+        inst = dict.__new__(ResourceInstance)
+        dict.update(inst, self)
+        if self._changes is not None:
+            object.__setattr__(inst, '_changes', set(self._changes))
+        return inst
+
+    def __deepcopy__(self, memo):
+        inst = dict.__new__(ResourceInstance)
+        memo[id(self)] = inst
+        for key, value in dict.items(self):
+            value = copy.deepcopy(value, memo)
+            dict.__setitem__(inst, key, value)
+            if key not in ('_links', '_embedded'):
+                _adopt(inst, key, value)
+        if self._changes is not None:
+            object.__setattr__(inst, '_changes', set(self._changes))
+        return inst
+
     def __repr__(self):
         return "<%s '%s' at %s>" % (
             'empty' if not self else 'populated',
@@ -392,6 +981,98 @@ class ResourceInstance(DictionaryWrapper):
         """
         return json.dumps(self, sort_keys=True, indent=4)
 
+    def prefetch(self, path, max_workers=8, deadline=None):
+        """ Resolve the named link (or dotted link path) for this instance.
+
+        See `prefetch` for details.
+        """
+        return prefetch([self], path, max_workers, deadline)
+
+
+_SNAPSHOT_VERSION = 2
+
+
+def _snapshot_hook(dict_):
+    # Nested dicts are decoded first, so their values are already wrapped and
+    # can be copied over without going through DictionaryWrapper.__setitem__;
+    # only their owners need to be set.
+    wrapper = dict.__new__(DictionaryWrapper)
+    dict.update(wrapper, dict_)
+    for key, value in dict_.items():
+        kind = type(value)
+        if kind is DictionaryWrapper:
+            object.__setattr__(value, '_owner', (wrapper, key, False))
+        elif kind is list:
+            _adopt(wrapper, key, value)
+    return wrapper
+
+
+def loads(data, cfg=None):
+    """ Rebuild a ResourceInstance from a snapshot created by `dumps`.
+
+    All links are bound to `cfg` (a Context or its config). No affordance functions are created until
+    a link is actually called, and state is copied in without going through
+    DictionaryWrapper.__setitem__, which makes this faster than running
+    `_from_response` on the original JSON.
+    """
+    if cfg is not None:
+        cfg = _config(cfg)
+    if isinstance(data, bytes):
+        data = zlib.decompress(data).decode('utf-8')
+    version, snap = json.loads(data, object_hook=_snapshot_hook)
+    if version != _SNAPSHOT_VERSION:
+        raise ValueError('Unsupported snapshot version: %s' % version)
+
+    def load_links(snap_links):
+        links = dict.__new__(LinkContainer)
+        for item in snap_links:
+            if len(item) == 2:
+                dict.__setitem__(links, item[0], load_links(item[1]))
+            else:
+                name, method, href, templated, body = item
+                dict.__setitem__(links, name, Link(cfg, method, href, templated, body))
+        return links
+
+    def load_instance(snap):
+        state, snap_links, snap_embedded = snap
+        inst = dict.__new__(ResourceInstance)
+        dict.update(inst, state)
+        for key, value in dict.items(state):
+            kind = type(value)
+            if kind is DictionaryWrapper:
+                object.__setattr__(value, '_owner', (inst, key, False))
+            elif kind is list:
+                _adopt(inst, key, value)
+
+        embedded = dict.__new__(DictionaryWrapper)
+        for name, items in snap_embedded:
+            listing = EmbeddedList(name)
+            pk_field = listing._pk_field
+            for item in items:
+                item = load_instance(item)
+                list.append(listing, item)
+                pk = dict.get(item, pk_field)
+                if pk is not None:
+                    listing._id_mapping[pk] = len(listing) - 1
+            dict.__setitem__(embedded, name, listing)
+
+        dict.__setitem__(inst, '_links', load_links(snap_links))
+        dict.__setitem__(inst, '_embedded', embedded)
+        object.__setattr__(inst, '_changes', set())
+        return inst
+
+    return load_instance(snap)
+
+
+def _hydrate(cfg, dict_, stats=None):
+    """ Build a ResourceInstance from a response, timing it into `stats`."""
+    started = time.monotonic()
+    inst = ResourceInstance()
+    inst._from_response(cfg, dict_)
+    if stats is not None:
+        stats['hydration'] = time.monotonic() - started
+    return inst
+
 
 def create_affordance(cfg, method, href, templated):
     """Create and return a new affordance function based on provided args.
@@ -421,22 +1102,34 @@ def create_affordance(cfg, method, href, templated):
         parent scope.
         Postional args replace tempalted positional URI args, while kwargs
         replace option URI query parameters (and eventually JSON body params).
+        The `deadline`, `stats` and `request_attempts` kwargs are passed
+        through to `send`, and the time spent hydrating the response is
+        added to `stats` as "hydration".
         """
 
         body = {}
         if 'body' in kwargs:
             body = kwargs['body']
             del kwargs['body']
+        deadline = kwargs.pop('deadline', None)
+        stats = kwargs.pop('stats', None)
+        request_attempts = kwargs.pop('request_attempts', None)
 
         if not templated:
             # href is not tempalted, so we can just do the HTTP call.
             for key, val in kwargs.items():
                 warnings.warn("function kwarg '%s' not a valid URI query param" % key, UserWarning)
-            dict_ = send(method, cfg, href, json_data=body, **kwargs)
-            inst = ResourceInstance()
-            inst._from_response(cfg, dict_)
-
-            return inst
+            dict_ = send(
+                method,
+                cfg,
+                href,
+                json_data=body,
+                deadline=deadline,
+                stats=stats,
+                request_attempts=request_attempts,
+                **kwargs
+            )
+            return _hydrate(cfg, dict_, stats)
 
         # Convert args and kwargs (both keys and vals) to be strings.
         args = [str(arg) for arg in args]
@@ -511,10 +1204,15 @@ def create_affordance(cfg, method, href, templated):
             non_templated_href = kwArgRegEx.sub('', non_templated_href)
             if '?' in non_templated_href:
                 non_templated_href = non_templated_href[:non_templated_href.index('?')]
-        dict_ = send(method, cfg, non_templated_href, json_data=body, **kwargs)
-        inst = ResourceInstance()
-
-        inst._from_response(cfg, dict_)
-
-        return inst
+        dict_ = send(
+            method,
+            cfg,
+            non_templated_href,
+            json_data=body,
+            deadline=deadline,
+            stats=stats,
+            request_attempts=request_attempts,
+            **kwargs
+        )
+        return _hydrate(cfg, dict_, stats)
     return fn
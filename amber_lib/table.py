@@ -0,0 +1,322 @@
+""" Columnar tables built from ResourceInstances, for analytics.
+
+A Table stores one compact column per dotted field path (for example
+"shipping_information.volume") instead of a dictionary per item. Numbers and
+booleans are kept in typed arrays, strings are dictionary-encoded and every
+column has a null mask, so a full catalog fits in a fraction of the memory.
+Filters and aggregations operate on whole columns at once.
+
+For example:
+
+    >>> prods = ctx.products.query(limit=500)
+    >>> table = prods._embedded.products.to_table()
+    >>> heavy = table.filter(query.Predicate("shipping_information.volume", ">", 54.32))
+    >>> heavy.mean("shipping_information.volume")
+"""
+
+from array import array
+from itertools import compress
+import operator
+
+from amber_lib import query
+
+
+_OPERATORS = {
+    '=': operator.eq,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda value, options: value in options,
+    'not in': lambda value, options: value not in options,
+}
+
+_INT_MIN = -2 ** 63
+_INT_MAX = 2 ** 63 - 1
+
+
+def _kind_of(value):
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        if _INT_MIN <= value <= _INT_MAX:
+            return 'int'
+        return 'object'
+    if isinstance(value, float):
+        return 'float'
+    if isinstance(value, str):
+        return 'str'
+    return 'object'
+
+
+def _flatten(value, prefix, out):
+    """ Flatten nested dictionaries into dotted path->value pairs."""
+    for key, val in value.items():
+        if not prefix and key in ('_links', '_embedded'):
+            continue
+        path = '%s.%s' % (prefix, key) if prefix else key
+        if isinstance(val, dict) and val:
+            _flatten(val, path, out)
+        else:
+            out[path] = val
+    return out
+
+
+def _and(first, second):
+    return (
+        int.from_bytes(first, 'little') & int.from_bytes(second, 'little')
+    ).to_bytes(len(first), 'little')
+
+
+def _or(first, second):
+    return (
+        int.from_bytes(first, 'little') | int.from_bytes(second, 'little')
+    ).to_bytes(len(first), 'little')
+
+
+class Column(object):
+    """ The values of a single field path, stored compactly.
+
+    `kind` is one of "bool", "int", "float", "str" or "object". Bool, int
+    and float columns store their values in an `array`; str columns store
+    an array of codes into `dictionary`; object columns (lists, mixed types,
+    etc.) fall back to a plain list. `valid` holds a 1 for every non-null
+    value and a 0 for every null.
+    """
+
+    _TYPECODES = {'bool': 'b', 'int': 'q', 'float': 'd', 'str': 'l'}
+
+    def __init__(self, kind=None):
+        self.kind = kind
+        self.data = self._new_data(kind)
+        self.valid = bytearray()
+        self.dictionary = []
+        self._codes = {} # str->code pairs for `dictionary`
+
+    def _new_data(self, kind, values=()):
+        if kind in self._TYPECODES:
+            return array(self._TYPECODES[kind], values)
+        return list(values)
+
+    def _promote(self, kind):
+        """ Convert the stored values so that `kind` values can be appended."""
+        if self.kind is None:
+            self.kind = kind
+            self.data = self._new_data(kind, [0] * len(self.valid))
+        elif {self.kind, kind} == {'int', 'float'}:
+            self.kind = 'float'
+            self.data = self._new_data('float', self.data)
+        else:
+            values = self.to_list()
+            self.kind = 'object'
+            self.data = values
+            self.dictionary = []
+            self._codes = {}
+
+    def append(self, value):
+        if value is None:
+            self.valid.append(0)
+            if self.kind is None or self.kind == 'object':
+                self.data.append(None)
+            else:
+                self.data.append(0)
+            return
+
+        kind = _kind_of(value)
+        if kind != self.kind and self.kind != 'object':
+            if not (self.kind == 'float' and kind == 'int'):
+                self._promote(kind)
+
+        self.valid.append(1)
+        if self.kind == 'str':
+            code = self._codes.get(value)
+            if code is None:
+                code = self._codes[value] = len(self.dictionary)
+                self.dictionary.append(value)
+            self.data.append(code)
+        else:
+            self.data.append(value)
+
+    def __len__(self):
+        return len(self.valid)
+
+    def _values(self):
+        """ Return an iterable of the non-null (decoded) values."""
+        values = compress(self.data, self.valid)
+        if self.kind == 'str':
+            dictionary = self.dictionary
+            return (dictionary[code] for code in values)
+        if self.kind == 'bool':
+            return map(bool, values)
+        return values
+
+    def to_list(self):
+        """ Return every value as a list, with None for nulls."""
+        if self.kind == 'str':
+            dictionary = self.dictionary
+            return [
+                dictionary[code] if ok else None
+                for code, ok in zip(self.data, self.valid)
+            ]
+        if self.kind == 'bool':
+            return [bool(v) if ok else None for v, ok in zip(self.data, self.valid)]
+        return [v if ok else None for v, ok in zip(self.data, self.valid)]
+
+    def mask(self, operand, value):
+        """ Return a mask of the rows where `<row value> <operand> value`.
+
+        Null values never match.
+        """
+        if operand not in _OPERATORS:
+            raise ValueError('Unsupported operand: %s' % operand)
+        op = _OPERATORS[operand]
+
+        if self.kind == 'str':
+            # Evaluate once per distinct string, then map codes to the result.
+            matches = bytearray(op(s, value) for s in self.dictionary)
+            return bytearray(
+                ok and matches[code] for code, ok in zip(self.data, self.valid)
+            )
+        return bytearray(
+            ok and bool(op(v, value)) for v, ok in zip(self.data, self.valid)
+        )
+
+    def take(self, mask):
+        """ Return a new column containing only the rows selected by `mask`."""
+        column = Column(self.kind)
+        column.data = self._new_data(self.kind, compress(self.data, mask))
+        column.valid = bytearray(compress(self.valid, mask))
+        column.dictionary = self.dictionary
+        column._codes = self._codes
+        return column
+
+
+class Table(object):
+    """ A set of equal length columns, keyed by dotted field path."""
+
+    def __init__(self, columns=None, length=0):
+        self.columns = columns if columns else {}
+        self.length = length
+
+    @classmethod
+    def from_instances(cls, instances, fields=None):
+        """ Build a table from an iterable of ResourceInstances (or dicts).
+
+        Items are consumed one at a time, so `instances` may be a streamed
+        collection such as Crawler.crawl(). When `fields` (a list of dotted
+        paths) is not provided, a column is created for every leaf path seen.
+        """
+        table = cls()
+        columns = table.columns
+        if fields:
+            for field in fields:
+                columns[field] = Column()
+
+        for inst in instances:
+            flat = _flatten(inst, '', {})
+            if not fields:
+                for path in flat:
+                    if path not in columns:
+                        # Back-fill nulls for the rows that came before.
+                        column = columns[path] = Column()
+                        for _ in range(table.length):
+                            column.append(None)
+            for path, column in columns.items():
+                column.append(flat.get(path))
+            table.length += 1
+        return table
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, path):
+        return self.columns[path]
+
+    def __contains__(self, path):
+        return path in self.columns
+
+    def mask(self, where):
+        """ Evaluate a query.Predicate (or WhereItem, And, Or) as a row mask."""
+        if isinstance(where, query.Predicate):
+            return self.columns[where.subject].mask(where.operand, where.value)
+        if not isinstance(where, query.WhereItem):
+            raise TypeError("'%s' must be a Predicate or WhereItem" % where)
+
+        parts = ([where.pred] if where.pred else []) + where.items
+        if not parts:
+            return bytearray([1] * self.length)
+
+        # And and Or combine all of their parts the same way (their items'
+        # operands are not reliable); other WhereItems go by each operand.
+        mask = self.mask(parts[0])
+        for part in parts[1:]:
+            if isinstance(where, query.Or):
+                combine = _or
+            elif isinstance(where, query.And):
+                combine = _and
+            else:
+                combine = _or if part.operand.lower() == 'or' else _and
+            mask = combine(mask, self.mask(part))
+        return mask
+
+    def take(self, mask):
+        """ Return a new table with only the rows selected by `mask`."""
+        return Table(
+            {path: column.take(mask) for path, column in self.columns.items()},
+            bytes(mask).count(1)
+        )
+
+    def filter(self, where):
+        """ Return a new table with only the rows matching `where`."""
+        return self.take(self.mask(where))
+
+    def count(self, path):
+        """ Return the number of non-null values in the column."""
+        return self.columns[path].valid.count(1)
+
+    def sum(self, path):
+        return sum(self.columns[path]._values())
+
+    def mean(self, path):
+        count = self.count(path)
+        if not count:
+            return None
+        return self.sum(path) / count
+
+    def min(self, path):
+        return min(self.columns[path]._values(), default=None)
+
+    def max(self, path):
+        return max(self.columns[path]._values(), default=None)
+
+    def to_dict(self):
+        """ Return a path->list of values dictionary, with None for nulls."""
+        return {path: column.to_list() for path, column in self.columns.items()}
+
+    def to_parquet(self, path):
+        """ Write the table to a Parquet file. Requires `pyarrow`."""
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError('Writing Parquet files requires the pyarrow package')
+
+        arrays = {}
+        for name, column in self.columns.items():
+            if column.kind == 'object':
+                # Lists, mixed types, etc. have no fixed Parquet type.
+                values = [None if v is None else str(v) for v in column.to_list()]
+                arrays[name] = pyarrow.array(values, type=pyarrow.string())
+            elif column.kind == 'str':
+                arrays[name] = pyarrow.DictionaryArray.from_arrays(
+                    pyarrow.array(
+                        [c if ok else None for c, ok in zip(column.data, column.valid)],
+                        type=pyarrow.int64()
+                    ),
+                    pyarrow.array(column.dictionary, type=pyarrow.string())
+                )
+            else:
+                arrays[name] = pyarrow.array(column.to_list())
+        pyarrow.parquet.write_table(pyarrow.table(arrays), path)
@@ -0,0 +1,147 @@
+""" Transports which record and replay API traffic.
+
+A transport is anything `send` can use in place of `requests` via the
+`session` config option, i.e. it provides `request(method, url, **kwargs)`
+returning a response with `status_code` and `json()`. These allow pipelines
+to be load-tested and benchmarked deterministically, without network access.
+
+Record real traffic once:
+
+    >>> with RecordingTransport('products.cassette') as transport:
+    ...     ctx = Context(session=transport, ...)
+    ...     crawl_everything(ctx)
+
+And replay it as often as needed, optionally with the recorded latency:
+
+    >>> ctx = Context(session=ReplayTransport('products.cassette'), ...)
+
+Requests are matched on method, URL, body and public key. The `Timestamp`
+and `Authorization` headers change with every request and are ignored.
+"""
+
+import gzip
+import json
+import threading
+import time
+
+import requests
+
+from amber_lib import errors
+
+
+def _request_key(method, url, data, headers):
+    headers = headers if headers else {}
+    return (method.lower(), url, data if data else '', headers.get('Public-Key', ''))
+
+
+class RecordedResponse(object):
+    """ A response read back from a cassette."""
+
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+    @property
+    def content(self):
+        return self.text.encode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class RecordingTransport(object):
+    """ Send requests for real, recording every request/response pair.
+
+    Recordings are written to `path` (a gzipped JSON-lines cassette) by
+    `save`, which is also called when used as a context manager.
+    """
+
+    def __init__(self, path, session=None):
+        self.path = path
+        self.session = session if session else requests
+        self.recordings = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        start = time.monotonic()
+        r = self.session.request(method, url, **kwargs)
+        latency = time.monotonic() - start
+
+        method, url, data, public = _request_key(
+            method,
+            url,
+            kwargs.get('data'),
+            kwargs.get('headers')
+        )
+        with self._lock:
+            self.recordings.append(
+                [method, url, data, public, r.status_code, round(latency, 4), r.text]
+            )
+        return r
+
+    def save(self):
+        with self._lock:
+            with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+                for recording in self.recordings:
+                    f.write(json.dumps(recording, separators=(',', ':')))
+                    f.write('\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.save()
+
+
+class ReplayTransport(object):
+    """ Answer requests from a cassette created by RecordingTransport.
+
+    When a request was recorded several times (e.g. a retry after a 500),
+    the recordings are replayed in order, after which the last one is
+    repeated. By default responses are returned immediately; set `latency`
+    to sleep for the recorded latency multiplied by `latency`. When that is
+    longer than the request's read timeout, the transport sleeps for the
+    timeout instead and raises requests.exceptions.ReadTimeout, just as a
+    slow server would.
+
+    A request with no recording raises errors.UnmatchedRequest. It is safe
+    to share a ReplayTransport between threads.
+    """
+
+    def __init__(self, path, latency=0):
+        self.latency = latency
+        self._recordings = {}
+        self._cursors = {}
+        self._lock = threading.Lock()
+
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                method, url, data, public, status, latency_, text = json.loads(line)
+                key = (method, url, data, public)
+                self._recordings.setdefault(key, []).append((status, latency_, text))
+
+    def request(self, method, url, **kwargs):
+        key = _request_key(method, url, kwargs.get('data'), kwargs.get('headers'))
+        with self._lock:
+            if key not in self._recordings:
+                raise errors.UnmatchedRequest(method, url)
+            recordings = self._recordings[key]
+            index = self._cursors.get(key, 0)
+            self._cursors[key] = min(index + 1, len(recordings) - 1)
+
+        status, latency, text = recordings[index]
+        if self.latency:
+            delay = latency * self.latency
+            timeout = kwargs.get('timeout')
+            if isinstance(timeout, tuple):
+                timeout = timeout[1]
+            if timeout is not None and delay > timeout:
+                time.sleep(timeout)
+                raise requests.exceptions.ReadTimeout(method, url)
+            time.sleep(delay)
+        return RecordedResponse(status, text)
+
+    def rewind(self):
+        """ Start replaying every request from its first recording again."""
+        with self._lock:
+            self._cursors = {}
@@ -0,0 +1,126 @@
+""" An in-memory stand-in for the Amber Engine API, used as a Context session."""
+
+import json
+import threading
+from urllib.parse import parse_qs, urlparse
+
+
+TOTAL_PRODUCTS = 250
+
+ROOT = {
+    "products": {
+        "query": {"name": "query", "href": "/products{?limit,offset}", "templated": True},
+        "retrieve": {"name": "retrieve", "href": "/products/{id}", "templated": True},
+    },
+    "brands": {
+        "retrieve": {"name": "retrieve", "href": "/brands/{id}", "templated": True},
+    },
+}
+
+
+def product(i):
+    return {
+        "guid": "guid-%i" % i,
+        "id": i,
+        "name": "product %i" % i,
+        "price": i * 1.5,
+        "shipping_information": {"volume": i % 7, "carrier": "carrier %i" % (i % 3)},
+        "_embedded": {
+            "brands": [{"id": i % 4, "name": "brand %i" % (i % 4)}],
+        },
+        "_links": {
+            "brand": {"name": "brand", "href": "/brands/%i" % (i % 4)},
+            "update": {"name": "update", "method": "patch", "href": "/products/%i" % i},
+        },
+    }
+
+
+class Response(object):
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self.text = json.dumps(data if data is not None else {})
+
+    @property
+    def content(self):
+        return self.text.encode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeSession(object):
+    """ Answer requests like the API would, recording every request made.
+
+    `status_for` may be set to a function taking (method, url) and returning
+    a status code to respond with instead of 200 (or None).
+    """
+
+    def __init__(self, status_for=None):
+        self.requests = []
+        self.status_for = status_for
+        self._lock = threading.Lock()
+
+    def count(self, method):
+        return len([r for r in self.requests if r[0] == method])
+
+    def request(self, method, url, data=None, headers=None, timeout=None):
+        with self._lock:
+            self.requests.append((method, url, data, timeout))
+
+        if self.status_for:
+            status = self.status_for(method, url)
+            if status:
+                return Response(status)
+
+        parsed = urlparse(url)
+        params = parse_qs(parsed.query)
+        path = parsed.path
+
+        if method == 'options':
+            return Response(200, ROOT)
+        if method == 'patch':
+            return Response(200, json.loads(data))
+        if path == '/products':
+            limit = int(params.get('limit', ['50'])[0])
+            offset = int(params.get('offset', ['0'])[0])
+            items = [product(i) for i in range(offset, min(offset + limit, TOTAL_PRODUCTS))]
+            return Response(200, {"_embedded": {"products": items}})
+        if path.startswith('/products/'):
+            return Response(200, product(int(path.rsplit('/', 1)[1])))
+        if path.startswith('/brands/'):
+            id_ = int(path.rsplit('/', 1)[1])
+            return Response(200, {
+                "id": id_,
+                "name": "brand %i" % id_,
+                "_links": {
+                    "manufacturer": {"name": "manufacturer", "href": "/manufacturers/%i" % (id_ % 2)},
+                },
+            })
+        if path.startswith('/manufacturers/'):
+            return Response(200, {"id": int(path.rsplit('/', 1)[1])})
+        return Response(404)
+
+
+class ExpiredSession(FakeSession):
+    """ A session whose token has expired: every query responds with a 440."""
+
+    def __init__(self):
+        super(ExpiredSession, self).__init__(
+            lambda method, url: 440 if '/products' in url else None
+        )
+
+
+_hosts = [0]
+
+
+def context(**kwargs):
+    """ Create a Context using a FakeSession, on a host no other test shares.
+
+    Base resources are shared between Contexts of the same host, so a unique
+    host keeps tests independent of each other.
+    """
+    from amber_lib import Context
+
+    _hosts[0] += 1
+    kwargs.setdefault('session', FakeSession())
+    return Context(host='http://test-%i' % _hosts[0], port='80', **kwargs)
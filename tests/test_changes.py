@@ -0,0 +1,157 @@
+import json
+import unittest
+
+from amber_lib import errors
+from amber_lib.resources import save_many
+
+from tests import fake
+
+
+class TestChanges(unittest.TestCase):
+    def setUp(self):
+        self.ctx = fake.context()
+        self.session = self.ctx.config.session
+        self.prods = self.ctx.products.query(limit=3)._embedded.products
+        self.prod = self.prods[0]
+
+    def test_populated_is_clean(self):
+        self.assertEqual(self.prod.diff(), {})
+
+    def test_top_level(self):
+        self.prod.name = 'renamed'
+        self.assertEqual(self.prod.diff(), {'name': 'renamed'})
+
+    def test_nested(self):
+        self.prod.shipping_information.volume = 10
+        self.assertEqual(
+            self.prod.diff(),
+            {'shipping_information': {'volume': 10}}
+        )
+
+    def test_delete(self):
+        del self.prod['price']
+        self.assertEqual(self.prod.diff(), {'price': None})
+
+    def test_parent_replaced(self):
+        self.prod.shipping_information.volume = 10
+        self.prod.shipping_information = {'volume': 1}
+        self.assertEqual(
+            self.prod.diff(),
+            {'shipping_information': {'volume': 1}}
+        )
+
+    def test_list_item(self):
+        self.prod.tags = [{'name': 'a'}]
+        self.prod._track_changes()
+
+        self.prod.tags[0].name = 'b'
+        self.assertEqual(self.prod.diff(), {'tags': [{'name': 'b'}]})
+
+    def test_pop(self):
+        self.prod.pop('price')
+        self.prod.pop('missing', None)
+        self.assertEqual(self.prod.diff(), {'price': None})
+
+    def test_popitem(self):
+        info = self.prod.shipping_information
+        key, _ = info.popitem()
+        self.assertEqual(self.prod.diff(), {'shipping_information': {key: None}})
+
+    def test_setdefault(self):
+        self.prod.setdefault('name', 'ignored')
+        self.assertEqual(self.prod.diff(), {})
+
+        self.prod.setdefault('color', {'hex': 'fff'}).hex = '000'
+        self.assertEqual(self.prod.diff(), {'color': {'hex': '000'}})
+
+    def test_clear(self):
+        self.prod.shipping_information.clear()
+        self.assertEqual(
+            self.prod.diff(),
+            {'shipping_information': {'volume': None, 'carrier': None}}
+        )
+
+    def test_shared_wrapper_copied(self):
+        other = self.prods[1]
+        other.ship2 = self.prod.shipping_information
+        self.prod.shipping_information.volume = 42
+
+        self.assertEqual(self.prod.diff(), {'shipping_information': {'volume': 42}})
+        self.assertEqual(other.diff(), {'ship2': {'volume': 0, 'carrier': 'carrier 0'}})
+
+    def test_reassign_same_wrapper(self):
+        info = self.prod.shipping_information
+        self.prod.shipping_information = info
+        self.prod._track_changes()
+
+        info.volume = 5
+        self.assertEqual(self.prod.diff(), {'shipping_information': {'volume': 5}})
+
+    def test_replaced_wrapper_released(self):
+        old = self.prod.shipping_information
+        self.prod.shipping_information = {'volume': 1}
+        self.prod._track_changes()
+
+        old.volume = 99
+        self.assertEqual(self.prod.diff(), {})
+
+    def test_removed_wrapper_released(self):
+        for remove in [
+            lambda p: p.pop('shipping_information'),
+            lambda p: p.__delitem__('shipping_information'),
+            lambda p: p.clear(),
+        ]:
+            prod = self.ctx.products.query(limit=1)._embedded.products[0]
+            old = prod.shipping_information
+            remove(prod)
+            prod._track_changes()
+
+            old.volume = 99
+            self.assertEqual(prod.diff(), {})
+
+    def test_save(self):
+        self.prod.name = 'renamed'
+        self.prod.save()
+
+        method, url, data, _ = self.session.requests[-1]
+        self.assertEqual(method, 'patch')
+        self.assertTrue(url.endswith('/products/0'))
+        self.assertEqual(json.loads(data), {'name': 'renamed'})
+        self.assertEqual(self.prod.diff(), {})
+
+    def test_edit_during_save(self):
+        def status_for(method, url):
+            if method == 'patch':
+                self.prod.price = 1.0 # Edited while the PATCH is in flight.
+
+        self.session.status_for = status_for
+        self.prod.name = 'renamed'
+        self.prod.save()
+
+        self.assertEqual(self.prod.diff(), {'price': 1.0})
+
+    def test_failed_save_keeps_changes(self):
+        self.session.status_for = lambda method, url: 400 if method == 'patch' else None
+        self.prod.name = 'renamed'
+
+        with self.assertRaises(errors.BadRequest):
+            self.prod.save()
+        self.assertEqual(self.prod.diff(), {'name': 'renamed'})
+
+    def test_save_unchanged(self):
+        before = len(self.session.requests)
+        self.assertIsNone(self.prod.save())
+        self.assertEqual(len(self.session.requests), before)
+
+    def test_save_without_patch_link(self):
+        brand = self.prod._embedded.brands[0]
+        brand.name = 'renamed'
+        self.assertRaises(AttributeError, brand.save)
+
+    def test_save_many(self):
+        self.prods[1].name = 'renamed'
+        before = self.session.count('patch')
+
+        responses = save_many(self.prods)
+        self.assertEqual(len(responses), 1)
+        self.assertEqual(self.session.count('patch') - before, 1)
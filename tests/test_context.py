@@ -0,0 +1,45 @@
+import copy
+import unittest
+
+from amber_lib import Context
+
+from tests import fake
+
+
+class TestBaseResources(unittest.TestCase):
+    def setUp(self):
+        self.ctx = fake.context()
+        self.session = self.ctx.config.session
+
+    def test_shared_between_contexts(self):
+        other = Context(
+            host=self.ctx.config.host,
+            port=self.ctx.config.port,
+            session=self.session
+        )
+        self.ctx.products
+        other.products
+        other.brands
+
+        self.assertEqual(self.session.count('options'), 1)
+        self.assertIsNot(self.ctx.products, other.products)
+
+    def test_missing_names_cached(self):
+        for name in ['a', 'b', 'a', 'b', 'a']:
+            self.assertFalse(hasattr(self.ctx, name))
+
+        # One fetch for the initial load, then one more for the second miss.
+        self.assertEqual(self.session.count('options'), 2)
+        self.assertTrue(hasattr(self.ctx, 'products'))
+        self.assertEqual(self.session.count('options'), 2)
+
+    def test_refresh(self):
+        self.ctx.products
+        self.ctx.refresh_base_resources()
+        self.ctx.products
+        self.assertEqual(self.session.count('options'), 2)
+
+    def test_special_attributes(self):
+        copy.copy(self.ctx)
+        self.assertFalse(hasattr(self.ctx, '__length_hint__'))
+        self.assertEqual(self.session.count('options'), 0)
@@ -0,0 +1,39 @@
+import time
+import unittest
+
+from amber_lib import errors
+from amber_lib.crawler import Crawler
+from amber_lib.resources import ResourceInstance
+
+from tests import fake
+
+
+class TestCrawler(unittest.TestCase):
+    def test_crawl_every_item_once(self):
+        ctx = fake.context()
+        crawler = Crawler(ctx, 'products', shard_size=40, processes=2, transport=fake.FakeSession)
+        items = list(crawler.crawl())
+
+        self.assertEqual(len(items), fake.TOTAL_PRODUCTS)
+        self.assertEqual(len(set(item.guid for item in items)), fake.TOTAL_PRODUCTS)
+        self.assertIsInstance(items[0], ResourceInstance)
+
+    def test_worker_settings(self):
+        ctx = fake.context(connect_timeout=2, read_timeout=5)
+        crawler = Crawler(ctx, 'products', transport=fake.FakeSession)
+        self.assertEqual(crawler.settings['connect_timeout'], 2)
+        self.assertEqual(crawler.settings['read_timeout'], 5)
+
+    def test_stop_early(self):
+        ctx = fake.context()
+        crawler = Crawler(ctx, 'products', shard_size=10, processes=2, transport=fake.FakeSession)
+        started = time.monotonic()
+        for item in crawler.crawl():
+            break
+        self.assertTrue(time.monotonic() - started < 10)
+
+    def test_login_timeout_fails_fast(self):
+        ctx = fake.context()
+        crawler = Crawler(ctx, 'products', processes=1, transport=fake.ExpiredSession)
+        with self.assertRaises(errors.LoginTimeout):
+            list(crawler.crawl())
@@ -0,0 +1,55 @@
+import gc
+import unittest
+
+from amber_lib import IdentityMap
+
+from tests import fake
+
+
+class TestIdentityMap(unittest.TestCase):
+    def setUp(self):
+        self.identity_map = IdentityMap()
+        self.ctx = fake.context(identity_map=self.identity_map)
+
+    def test_shared_instance(self):
+        first = self.ctx.products.query(limit=5)
+        second = self.ctx.products.query(limit=5)
+
+        self.assertIs(first._embedded.products[0], second._embedded.products[0])
+        self.assertIs(
+            first._embedded.products[0]._embedded.brands[0],
+            first._embedded.products[4]._embedded.brands[0]
+        )
+
+    def test_repeat_hydration(self):
+        pages = [self.ctx.products.query(limit=5) for _ in range(3)]
+        prod = pages[0]._embedded.products[1]
+
+        self.assertEqual(len(prod._embedded.brands), 1)
+        self.assertEqual(len(prod._links), 2)
+
+    def test_refresh_removes_stale_keys(self):
+        page = self.ctx.products.query(limit=1)
+        prod = page._embedded.products[0]
+        dict.__setitem__(prod, 'stale', True)
+
+        self.ctx.products.query(limit=1)
+        self.assertNotIn('stale', prod)
+        self.assertEqual(prod.name, 'product 0')
+
+    def test_unsaved_changes_kept(self):
+        page = self.ctx.products.query(limit=1)
+        prod = page._embedded.products[0]
+        prod.name = 'changed'
+
+        self.ctx.products.query(limit=1)
+        self.assertEqual(prod.name, 'changed')
+        self.assertEqual(prod.diff(), {'name': 'changed'})
+
+    def test_entries_collected(self):
+        page = self.ctx.products.query(limit=5)
+        self.assertEqual(len(self.identity_map), 9) # 5 products, 4 brands
+
+        del page
+        gc.collect()
+        self.assertEqual(len(self.identity_map), 0)
@@ -0,0 +1,52 @@
+import unittest
+
+from amber_lib import errors
+from amber_lib.paging import AdaptivePager
+
+from tests import fake
+
+
+def limit_of(url):
+    return int(url.split('limit=')[1].split('&')[0])
+
+
+class TestAdaptivePager(unittest.TestCase):
+    def pager(self, status, **kwargs):
+        def status_for(method, url):
+            if method == 'get' and limit_of(url) > 50:
+                self.failed.append(limit_of(url))
+                return status
+
+        self.failed = []
+        self.session = fake.FakeSession(status_for)
+        ctx = fake.context(session=self.session)
+        return AdaptivePager(ctx.products.query, 'products', **kwargs)
+
+    def test_every_item(self):
+        ctx = fake.context()
+        pager = AdaptivePager(ctx.products.query, 'products', limit=40)
+
+        self.assertEqual(len(list(pager.items())), fake.TOTAL_PRODUCTS)
+
+    def test_shrinks_on_gateway_errors(self):
+        for status in (408, 500, 502, 504):
+            pager = self.pager(status)
+            items = list(pager.items())
+
+            self.assertEqual(len(items), fake.TOTAL_PRODUCTS)
+            # One failed request, not retried by send, and never repeated.
+            self.assertEqual(self.failed, [100])
+            self.assertEqual([page[0] for page in pager.history], [50] * 6)
+            self.assertEqual(pager.ceiling, 50)
+
+    def test_gives_up(self):
+        pager = self.pager(504, min_limit=100)
+        with self.assertRaises(errors.GatewayTimeout):
+            list(pager.items())
+        self.assertEqual(self.failed, [100] * pager.attempts)
+
+    def test_other_errors_not_retried(self):
+        pager = self.pager(404)
+        with self.assertRaises(errors.NotFound):
+            list(pager.items())
+        self.assertEqual(pager.history, [])
@@ -0,0 +1,69 @@
+import time
+import unittest
+
+from amber_lib import errors
+from amber_lib.resources import EmbeddedList, Link
+
+from tests import fake
+
+
+class TestPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.ctx = fake.context()
+        self.session = self.ctx.config.session
+        self.prods = self.ctx.products.query(limit=20)._embedded.products
+
+    def test_deduplicates_requests(self):
+        before = self.session.count('get')
+        brands = self.prods.prefetch('brand')
+
+        self.assertEqual(self.session.count('get') - before, 4)
+        self.assertEqual(len(brands), 4)
+        for prod in self.prods:
+            self.assertIsInstance(prod._embedded.brand, EmbeddedList)
+            self.assertEqual(prod._embedded.brand[0].id, prod.id % 4)
+
+    def test_multiple_levels(self):
+        manufacturers = self.prods.prefetch('brand.manufacturer')
+
+        self.assertEqual(sorted(m.id for m in manufacturers), [0, 1])
+        brand = self.prods[3]._embedded.brand[0]
+        self.assertEqual(brand._embedded.manufacturer[0].id, 1)
+
+    def test_keeps_existing_embedded(self):
+        for prod in self.prods:
+            prod._links['brands'] = prod._links['brand']
+        self.prods.prefetch('brands')
+
+        # The API already embedded each brand, so nothing is appended.
+        for prod in self.prods:
+            self.assertEqual(len(prod._embedded.brands), 1)
+
+    def test_body_params_not_merged(self):
+        first, second = self.prods[0], self.prods[4]
+        first._links['brand'] = Link(self.ctx.config, 'get', '/brands/0', False, {'a': 1})
+        second._links['brand'] = Link(self.ctx.config, 'get', '/brands/0', False, {'a': 2})
+
+        before = self.session.count('get')
+        EmbeddedList('products', [first, second]).prefetch('brand')
+        self.assertEqual(self.session.count('get') - before, 2)
+
+    def test_templated_link(self):
+        self.prods[0]._links['brand'] = Link(self.ctx.config, 'get', '/brands/{id}', True)
+        with self.assertRaises(TypeError):
+            self.prods.prefetch('brand')
+
+    def test_deadline(self):
+        def slow(method, url):
+            time.sleep(0.3)
+
+        self.session.status_for = slow
+        started = time.monotonic()
+        with self.assertRaises(errors.DeadlineExceeded):
+            self.prods.prefetch('brand', max_workers=2, deadline=started + 0.1)
+        self.assertTrue(time.monotonic() - started < 0.5)
+
+    def test_error_raised(self):
+        self.session.status_for = lambda method, url: 404 if url.endswith('/2') else None
+        with self.assertRaises(errors.NotFound):
+            self.prods.prefetch('brand')
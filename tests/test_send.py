@@ -0,0 +1,134 @@
+import base64
+import json
+import time
+import unittest
+
+import requests
+
+from amber_lib import errors
+from amber_lib.resources import _timeout, send
+
+from tests import fake
+
+
+def token(n):
+    claims = base64.b64encode(json.dumps({'sub': 'public'}).encode('utf-8')).decode('ascii')
+    return 'header.%s.%i' % (claims.rstrip('='), n)
+
+
+class TokenSession(fake.FakeSession):
+    """ Respond with a 440 until the token has been refreshed `expired` times."""
+
+    def __init__(self, expired):
+        super(TokenSession, self).__init__()
+        self.expired = expired
+        self.issued = 0
+
+    def request(self, method, url, data=None, headers=None, timeout=None):
+        if url.endswith('/tokens'):
+            self.issued += 1
+            return fake.Response(200, {'key': token(self.issued)})
+        if self.issued < self.expired:
+            with self._lock:
+                self.requests.append((method, url, data, timeout))
+            return fake.Response(440)
+        return super(TokenSession, self).request(method, url, data, headers, timeout)
+
+
+class SlowSession(fake.FakeSession):
+    """ Time out the first `slow` requests, like requests does."""
+
+    def __init__(self, slow):
+        super(SlowSession, self).__init__()
+        self.slow = slow
+
+    def request(self, method, url, data=None, headers=None, timeout=None):
+        if self.slow:
+            self.slow -= 1
+            with self._lock:
+                self.requests.append((method, url, data, timeout))
+            time.sleep(timeout[1] if timeout else 0)
+            raise requests.exceptions.ReadTimeout(method, url)
+        return super(SlowSession, self).request(method, url, data, headers, timeout)
+
+
+class TestTimeout(unittest.TestCase):
+    def test_configured(self):
+        cfg = fake.context(connect_timeout=2, read_timeout=5).config
+        self.assertEqual(_timeout(cfg, None, 'get', '/'), (2, 5))
+
+        cfg = fake.context().config
+        self.assertIsNone(_timeout(cfg, None, 'get', '/'))
+
+    def test_shortened_by_deadline(self):
+        cfg = fake.context(connect_timeout=0.1, read_timeout=5).config
+        connect, read = _timeout(cfg, time.monotonic() + 1, 'get', '/')
+        self.assertEqual(connect, 0.1)
+        self.assertTrue(0.9 < read <= 1)
+
+        connect, read = _timeout(fake.context().config, time.monotonic() + 1, 'get', '/')
+        self.assertTrue(0.9 < connect <= 1 and 0.9 < read <= 1)
+
+    def test_deadline_passed(self):
+        with self.assertRaises(errors.DeadlineExceeded):
+            _timeout(fake.context().config, time.monotonic(), 'get', '/')
+
+
+class TestSend(unittest.TestCase):
+    def test_timeout_passed_to_session(self):
+        ctx = fake.context(connect_timeout=2, read_timeout=5)
+        send('get', ctx.config, '/products/1')
+        self.assertEqual(ctx.config.session.requests[-1][3], (2, 5))
+
+    def test_read_timeout_retried(self):
+        session = SlowSession(2)
+        ctx = fake.context(session=session, read_timeout=0.01)
+        self.assertEqual(send('get', ctx.config, '/products/1')['id'], 1)
+        self.assertEqual(len(session.requests), 3)
+
+    def test_read_timeout_raised(self):
+        session = SlowSession(3)
+        ctx = fake.context(session=session, read_timeout=0.01)
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            send('get', ctx.config, '/products/1')
+        self.assertEqual(len(session.requests), 3)
+
+    def test_deadline(self):
+        session = SlowSession(10)
+        ctx = fake.context(session=session, read_timeout=5, request_attempts=10)
+        started = time.monotonic()
+        with self.assertRaises(errors.DeadlineExceeded):
+            send('get', ctx.config, '/products/1', deadline=started + 0.1)
+        self.assertTrue(time.monotonic() - started < 0.5)
+        self.assertEqual(len(session.requests), 1)
+
+    def test_token_refreshed_once(self):
+        refreshed = []
+        ctx = fake.context(
+            session=TokenSession(1),
+            token=token(0),
+            on_token_refresh=refreshed.append
+        )
+        self.assertEqual(send('get', ctx.config, '/products/1')['id'], 1)
+        self.assertEqual(refreshed, [token(1)])
+
+    def test_token_refresh_does_not_loop(self):
+        refreshed = []
+        session = TokenSession(100)
+        ctx = fake.context(session=session, token=token(0), on_token_refresh=refreshed.append)
+        with self.assertRaises(errors.LoginTimeout):
+            send('get', ctx.config, '/products/1', deadline=time.monotonic() + 0.2)
+        self.assertEqual(len(refreshed), 1)
+        self.assertEqual(len(session.requests), 2)
+
+    def test_token_refreshed_with_single_attempt(self):
+        ctx = fake.context(session=TokenSession(1), token=token(0), on_token_refresh=id)
+        result = send('get', ctx.config, '/products/1', request_attempts=1)
+        self.assertEqual(result['id'], 1)
+
+    def test_single_attempt(self):
+        session = SlowSession(1)
+        ctx = fake.context(session=session, read_timeout=0.01)
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            send('get', ctx.config, '/products/1', request_attempts=1)
+        self.assertEqual(len(session.requests), 1)
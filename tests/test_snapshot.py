@@ -0,0 +1,78 @@
+import copy
+from datetime import datetime
+import json
+import pickle
+import unittest
+
+from amber_lib.resources import EmbeddedList, ResourceInstance, loads
+
+from tests import fake
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.ctx = fake.context()
+        self.page = self.ctx.products.query(limit=10)
+
+    def assertSameTree(self, first, second):
+        self.assertEqual(json.loads(str(first)), json.loads(str(second)))
+
+    def test_round_trip(self):
+        for binary in [False, True]:
+            copy = loads(self.page.dumps(binary=binary), self.ctx.config)
+            self.assertSameTree(copy, self.page)
+
+            prod = copy._embedded.products[3]
+            self.assertIsInstance(prod, ResourceInstance)
+            self.assertIsInstance(copy._embedded.products, EmbeddedList)
+            self.assertIs(copy._embedded.products.pk('guid-3'), prod)
+            self.assertEqual(prod.shipping_information.volume, 3)
+            self.assertEqual(prod._links.brand().name, 'brand 3')
+
+    def test_pickle(self):
+        copy = pickle.loads(pickle.dumps(self.page))
+        self.assertSameTree(copy, self.page)
+
+        prod = copy._embedded.products[1]
+        with self.assertRaises(TypeError):
+            prod._links.brand()
+        copy.bind(self.ctx.config)
+        self.assertEqual(prod._links.brand().name, 'brand 1')
+
+    def test_loads_with_context(self):
+        prod = loads(self.page.dumps(), self.ctx)._embedded.products[2]
+        self.assertEqual(prod._links.brand().name, 'brand 2')
+
+        copy_ = pickle.loads(pickle.dumps(self.page))
+        copy_.bind(self.ctx)
+        self.assertEqual(copy_._embedded.products[2]._links.brand().name, 'brand 2')
+
+    def test_copy(self):
+        prod = self.page._embedded.products[1]
+        prod.added = datetime(2020, 1, 1)
+
+        for copy_ in [copy.copy(prod), copy.deepcopy(prod)]:
+            self.assertEqual(copy_.added, prod.added)
+            self.assertEqual(copy_.diff(), {'added': prod.added})
+            self.assertEqual(copy_._links.brand().name, 'brand 1')
+
+    def test_deepcopy_independent(self):
+        page = copy.deepcopy(self.page)
+        prod = page._embedded.products[1]
+        prod.shipping_information.volume = 9
+
+        self.assertEqual(prod.diff(), {'shipping_information': {'volume': 9}})
+        self.assertEqual(self.page._embedded.products[1].shipping_information.volume, 1)
+        self.assertEqual(self.page._embedded.products[1].diff(), {})
+        self.assertIs(page._embedded.products.pk('guid-1'), prod)
+
+    def test_changes_tracked(self):
+        prod = loads(self.page.dumps(), self.ctx.config)._embedded.products[2]
+        self.assertEqual(prod.diff(), {})
+
+        prod.shipping_information.carrier = 'other'
+        self.assertEqual(prod.diff(), {'shipping_information': {'carrier': 'other'}})
+
+    def test_unsupported_version(self):
+        with self.assertRaises(ValueError):
+            loads('[0, [{}, [], []]]')
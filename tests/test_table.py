@@ -0,0 +1,128 @@
+import unittest
+
+from amber_lib.crawler import Crawler
+from amber_lib.query import And, Or, Predicate
+from amber_lib.table import Column, Table
+
+from tests import fake
+
+
+def column(*values):
+    col = Column()
+    for value in values:
+        col.append(value)
+    return col
+
+
+class TestColumn(unittest.TestCase):
+    def test_kinds(self):
+        self.assertEqual(column(True, False).kind, 'bool')
+        self.assertEqual(column(1, 2).kind, 'int')
+        self.assertEqual(column(1.5).kind, 'float')
+        self.assertEqual(column('a').kind, 'str')
+        self.assertEqual(column([1]).kind, 'object')
+        self.assertEqual(column(2 ** 70).kind, 'object')
+
+    def test_int_promoted_to_float(self):
+        col = column(1, 2, 2.5)
+        self.assertEqual(col.kind, 'float')
+        self.assertEqual(col.to_list(), [1.0, 2.0, 2.5])
+
+        col.append(3)
+        self.assertEqual(col.kind, 'float')
+
+    def test_mixed_promoted_to_object(self):
+        col = column('a', 1, None, 'a')
+        self.assertEqual(col.kind, 'object')
+        self.assertEqual(col.to_list(), ['a', 1, None, 'a'])
+
+    def test_nulls(self):
+        col = column(None, 1, None, 3)
+        self.assertEqual(col.kind, 'int')
+        self.assertEqual(col.valid, bytearray([0, 1, 0, 1]))
+        self.assertEqual(col.to_list(), [None, 1, None, 3])
+        # Nulls never match, not even "!=".
+        self.assertEqual(col.mask('!=', 1), bytearray([0, 0, 0, 1]))
+
+    def test_dictionary_encoding(self):
+        col = column('x', 'y', 'x', None, 'x')
+        self.assertEqual(col.dictionary, ['x', 'y'])
+        self.assertEqual(list(col.data), [0, 1, 0, 0, 0])
+        self.assertEqual(col.to_list(), ['x', 'y', 'x', None, 'x'])
+        self.assertEqual(col.mask('=', 'x'), bytearray([1, 0, 1, 0, 1]))
+
+    def test_unsupported_operand(self):
+        with self.assertRaises(ValueError):
+            column(1).mask('~', 1)
+
+
+class TestTable(unittest.TestCase):
+    def setUp(self):
+        ctx = fake.context()
+        prods = ctx.products.query(limit=10)._embedded.products
+        self.table = prods.to_table()
+
+    def ids(self, where):
+        return self.table.filter(where)['id'].to_list()
+
+    def test_columns(self):
+        self.assertEqual(len(self.table), 10)
+        self.assertIn('shipping_information.volume', self.table)
+        self.assertNotIn('_links', self.table)
+        self.assertEqual(self.table['shipping_information.carrier'].kind, 'str')
+        self.assertEqual(self.table['price'].kind, 'float')
+
+    def test_back_fills_nulls(self):
+        table = Table.from_instances([{'a': 1}, {'b': 'x'}, {'a': 3}])
+        self.assertEqual(table.to_dict(), {'a': [1, None, 3], 'b': [None, 'x', None]})
+
+    def test_fields(self):
+        table = Table.from_instances([{'a': {'b': 1}, 'c': 2}], fields=['a.b', 'd'])
+        self.assertEqual(table.to_dict(), {'a.b': [1], 'd': [None]})
+
+    def test_filter(self):
+        self.assertEqual(self.ids(Predicate('id', '>=', 7)), [7, 8, 9])
+        self.assertEqual(
+            self.ids(And(Predicate('id', '>', 1), Predicate('id', '<', 5), Predicate('id', '!=', 3))),
+            [2, 4]
+        )
+        self.assertEqual(
+            self.ids(Or(Predicate('id', '<', 1), Predicate('id', '=', 5), Predicate('id', '>', 8))),
+            [0, 5, 9]
+        )
+
+    def test_nested_filter(self):
+        where = Or(And(Predicate('id', '<', 2), Predicate('id', '>=', 0)), Predicate('id', '>', 8))
+        self.assertEqual(self.ids(where), [0, 1, 9])
+
+        where = And(Or(Predicate('id', '<', 2), Predicate('id', '>', 7)), Predicate('id', '!=', 8))
+        self.assertEqual(self.ids(where), [0, 1, 9])
+
+    def test_filtered_strings(self):
+        table = self.table.filter(Predicate('shipping_information.carrier', '=', 'carrier 1'))
+        self.assertEqual(table['id'].to_list(), [1, 4, 7])
+        self.assertEqual(table['shipping_information.carrier'].to_list(), ['carrier 1'] * 3)
+
+    def test_aggregates(self):
+        self.assertEqual(self.table.count('id'), 10)
+        self.assertEqual(self.table.sum('id'), 45)
+        self.assertEqual(self.table.mean('id'), 4.5)
+        self.assertEqual(self.table.min('price'), 0.0)
+        self.assertEqual(self.table.max('price'), 13.5)
+
+    def test_aggregates_skip_nulls(self):
+        table = Table.from_instances([{'a': 1}, {'a': None}, {'a': 5}, {'b': 1}])
+        self.assertEqual(table.count('a'), 2)
+        self.assertEqual(table.mean('a'), 3)
+        self.assertEqual(table.min('a'), 1)
+        self.assertIsNone(table.filter(Predicate('a', '>', 9)).mean('a'))
+        self.assertIsNone(table.filter(Predicate('a', '>', 9)).max('a'))
+
+    def test_from_crawl(self):
+        ctx = fake.context()
+        crawler = Crawler(ctx, 'products', shard_size=50, processes=2, transport=fake.FakeSession)
+        table = Table.from_instances(crawler.crawl(), fields=['id', 'price'])
+
+        self.assertEqual(len(table), fake.TOTAL_PRODUCTS)
+        self.assertEqual(table.sum('id'), sum(range(fake.TOTAL_PRODUCTS)))
+        self.assertEqual(table['id'].kind, 'int')
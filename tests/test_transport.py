@@ -0,0 +1,136 @@
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import requests
+
+from amber_lib import Context, errors
+from amber_lib.transport import RecordingTransport, ReplayTransport
+
+from tests import fake
+
+
+URL = 'http://replay/products/1'
+
+
+def headers(stamp):
+    return {'Public-Key': 'key', 'Timestamp': stamp, 'Authorization': 'Bearer %s' % stamp}
+
+
+class TestTransport(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'test.cassette')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def record(self, count, status_for=None):
+        """ Record `count` GETs of URL, with a status from `status_for(index)`."""
+        calls = []
+
+        def status(method, url):
+            calls.append(url)
+            return status_for(len(calls) - 1) if status_for else None
+
+        with RecordingTransport(self.path, fake.FakeSession(status)) as transport:
+            for i in range(count):
+                transport.request('get', URL, data=None, headers=headers(str(i)))
+
+    def write(self, recordings):
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            for recording in recordings:
+                f.write(json.dumps(recording) + '\n')
+
+    def test_round_trip(self):
+        with RecordingTransport(self.path, fake.FakeSession()) as transport:
+            ctx = Context(host='http://replay-round-trip', session=transport)
+            recorded = ctx.products.query(limit=5)
+
+        # Replayed requests have a new (microsecond) Timestamp, and so a new
+        # Authorization signature, but must still match their recordings.
+        ctx = Context(host='http://replay-round-trip', session=ReplayTransport(self.path))
+        ctx.refresh_base_resources()
+        replayed = ctx.products.query(limit=5)
+        self.assertEqual(str(replayed), str(recorded))
+        self.assertEqual(
+            [p.guid for p in replayed._embedded.products],
+            [p.guid for p in recorded._embedded.products]
+        )
+
+    def test_ignores_changing_headers(self):
+        self.record(1)
+        r = ReplayTransport(self.path).request('get', URL, data=None, headers=headers('other'))
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json()['id'], 1)
+
+    def test_repeated_in_order(self):
+        self.record(3, lambda i: [500, 502, None][i])
+        transport = ReplayTransport(self.path)
+
+        replay = lambda: transport.request('get', URL, headers=headers('replay')).status_code
+        self.assertEqual([replay() for _ in range(4)], [500, 502, 200, 200])
+
+        transport.rewind()
+        self.assertEqual(replay(), 500)
+
+    def test_unmatched(self):
+        self.record(1)
+        transport = ReplayTransport(self.path)
+        with self.assertRaises(errors.UnmatchedRequest):
+            transport.request('get', 'http://replay/products/2')
+        with self.assertRaises(errors.UnmatchedRequest):
+            transport.request('post', URL, data='{}')
+
+    def test_threads(self):
+        count = 40
+        self.record(count, lambda i: 500 + i)
+        transport = ReplayTransport(self.path)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            statuses = list(pool.map(
+                lambda _: transport.request('get', URL, headers=headers('replay')).status_code,
+                range(count)
+            ))
+        # Every recording is replayed exactly once, whichever thread got it.
+        self.assertEqual(sorted(statuses), list(range(500, 500 + count)))
+
+    def test_latency(self):
+        self.write([['get', URL, '', '', 200, 0.2, '{}']])
+        started = time.monotonic()
+        ReplayTransport(self.path, latency=0.5).request('get', URL, timeout=(1, 1))
+        self.assertTrue(0.1 <= time.monotonic() - started < 0.2)
+
+    def test_read_timeout(self):
+        self.write([['get', URL, '', '', 200, 0.5, '{}']])
+        transport = ReplayTransport(self.path, latency=1)
+
+        started = time.monotonic()
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            transport.request('get', URL, timeout=(1, 0.05))
+        self.assertTrue(time.monotonic() - started < 0.5)
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            transport.request('get', URL, timeout=0.05)
+
+    def test_deadline(self):
+        with RecordingTransport(self.path, fake.FakeSession()) as transport:
+            Context(host='http://replay-deadline', session=transport).products.retrieve(1)
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            recordings = [json.loads(line) for line in f]
+        for recording in recordings:
+            if recording[0] == 'get':
+                recording[5] = 0.5 # A slow response.
+        self.write(recordings)
+
+        ctx = Context(host='http://replay-deadline', session=ReplayTransport(self.path, latency=1))
+        ctx.refresh_base_resources()
+        started = time.monotonic()
+        with self.assertRaises(errors.DeadlineExceeded):
+            ctx.products.retrieve(1, deadline=started + 0.1)
+        self.assertTrue(time.monotonic() - started < 0.5)